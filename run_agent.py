@@ -9,6 +9,8 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import asyncio
 from src.discovery_workshop import main
+from src.runtime import install_fast_event_loop
 
 if __name__ == "__main__":
+    install_fast_event_loop()
     asyncio.run(main())
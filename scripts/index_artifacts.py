@@ -4,14 +4,24 @@ This script scans blob storage and creates search index entries
 """
 import asyncio
 import logging
-import hashlib
-from datetime import datetime
-from azure.search.documents import SearchClient
+from typing import Dict, List, Optional
+import orjson
+from azure.search.documents.aio import SearchClient
+from azure.storage.blob.aio import ContainerClient
 from azure.core.credentials import AzureKeyCredential
 
-from src.config import Config
+from src.config import get_config
+from src.models import Artifact
 from src.storage_client import StorageClient
+from src.search_client import (
+    CONTENT_HASH_FIELD,
+    MAX_INDEXED_CONTENT_CHARS,
+    ensure_content_hash_field,
+    make_content_hash,
+    make_document_id
+)
 from src.document_processor import DocumentProcessor
+from src.runtime import install_fast_event_loop
 
 logging.basicConfig(
     level=logging.INFO,
@@ -19,71 +29,243 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Azure AI Search accepts up to 1000 documents / 16 MB per request;
+# stay comfortably below both limits
+MAX_BATCH_DOCUMENTS = 500
+MAX_BATCH_BYTES = 12_000_000
+
+# Bound on artifacts/documents buffered between pipeline stages
+QUEUE_SIZE = 64
+
+
+async def flush_batch(search_client: SearchClient, batch: List[Dict]) -> int:
+    """Upload a batch of documents in a single request. Returns number indexed."""
+    if not batch:
+        return 0
+    
+    indexed_count = 0
+    try:
+        results = await search_client.upload_documents(documents=batch)
+    except Exception as e:
+        logger.error(f"Error uploading batch of {len(batch)} documents: {e}")
+        return 0
+    
+    for result in results:
+        if result.succeeded:
+            logger.info(f"✓ Indexed: {result.key}")
+            indexed_count += 1
+        else:
+            logger.error(f"✗ Failed to index: {result.key} ({result.error_message})")
+    
+    return indexed_count
+
+
+async def upload_worker(search_client: SearchClient, queue: asyncio.Queue) -> int:
+    """Consume search documents from the queue and upload them in batches"""
+    indexed_count = 0
+    batch: List[Dict] = []
+    batch_bytes = 0
+    
+    while True:
+        search_document = await queue.get()
+        if search_document is None:  # All producers finished
+            break
+        
+        batch.append(search_document)
+        batch_bytes += len(orjson.dumps(search_document))
+        
+        if len(batch) >= MAX_BATCH_DOCUMENTS or batch_bytes >= MAX_BATCH_BYTES:
+            indexed_count += await flush_batch(search_client, batch)
+            batch = []
+            batch_bytes = 0
+    
+    # Upload remaining documents
+    indexed_count += await flush_batch(search_client, batch)
+    return indexed_count
+
+
+async def build_search_document(
+    artifact: Artifact,
+    container_client: ContainerClient,
+    document_processor: DocumentProcessor,
+    indexed_hashes: Optional[Dict[str, str]],
+    max_concurrency: int = 1
+) -> Optional[Dict]:
+    """Download and process a single artifact into a search document"""
+    try:
+        logger.info(f"Processing: {artifact.blob_name}")
+        
+        document_id = make_document_id(artifact.blob_name)
+        
+        # Download artifact
+        download_stream = await container_client.download_blob(
+            artifact.blob_name,
+            max_concurrency=max_concurrency
+        )
+        content = await download_stream.readall()
+        
+        # Skip processing and upload when the indexed content is unchanged
+        content_hash = make_content_hash(content)
+        if indexed_hashes is not None and indexed_hashes.get(document_id) == content_hash:
+            logger.info(f"Skipping (unchanged): {artifact.blob_name}")
+            return None
+        
+        # Document processing is blocking (parsers, Azure AI SDK calls)
+        processed = await asyncio.to_thread(
+            document_processor.process,
+            content,
+            artifact.document_type,
+            artifact.blob_name,
+            MAX_INDEXED_CONTENT_CHARS,
+            include_sheet_data=False  # Only text and keywords are indexed
+        )
+        
+        # Release the raw download before building the (smaller) search document
+        del content
+        
+        # Create search document
+        search_document = {
+            "id": document_id,
+            "blob_name": artifact.blob_name,
+            "content": processed.extracted_text,  # Limited to MAX_INDEXED_CONTENT_CHARS by the processor
+            "document_type": artifact.document_type.value,
+            "keywords": processed.keywords,
+            "last_modified": artifact.last_modified.isoformat()
+        }
+        if indexed_hashes is not None:
+            search_document[CONTENT_HASH_FIELD] = content_hash
+        return search_document
+        
+    except Exception as e:
+        logger.error(f"Error processing {artifact.blob_name}: {e}")
+        return None
+
+
+async def fetch_indexed_hashes(search_client: SearchClient) -> Dict[str, str]:
+    """Load content hashes already stored in the index, keyed by document ID"""
+    try:
+        results = await search_client.search(search_text="*", select=["id", CONTENT_HASH_FIELD])
+        return {
+            document["id"]: document[CONTENT_HASH_FIELD]
+            async for document in results
+            if document.get(CONTENT_HASH_FIELD)
+        }
+    except Exception as e:
+        logger.warning(f"Could not load indexed content hashes, re-indexing all artifacts: {e}")
+        return {}
+
+
+async def list_worker(
+    storage_client: StorageClient,
+    container_client: ContainerClient,
+    artifact_queue: asyncio.Queue,
+    worker_count: int
+) -> int:
+    """Stream artifacts from blob storage into the queue as they are listed"""
+    listed_count = 0
+    try:
+        async for blob in container_client.list_blobs():
+            await artifact_queue.put(storage_client.to_artifact(blob))
+            listed_count += 1
+    finally:
+        # Always release the processing workers, even if listing fails
+        for _ in range(worker_count):
+            await artifact_queue.put(None)
+    
+    logger.info(f"Found {listed_count} artifacts to index")
+    return listed_count
+
+
+async def process_worker(
+    artifact_queue: asyncio.Queue,
+    document_queue: asyncio.Queue,
+    container_client: ContainerClient,
+    document_processor: DocumentProcessor,
+    indexed_hashes: Optional[Dict[str, str]],
+    max_concurrency: int
+):
+    """Turn queued artifacts into search documents for the uploader"""
+    while True:
+        artifact = await artifact_queue.get()
+        if artifact is None:  # Lister finished
+            break
+        
+        search_document = await build_search_document(
+            artifact,
+            container_client,
+            document_processor,
+            indexed_hashes,
+            max_concurrency
+        )
+        if search_document:
+            await document_queue.put(search_document)
+
 
 async def index_artifacts():
     """Index all artifacts from blob storage into AI Search"""
     
     # Load configuration
-    config = Config()
+    config = get_config()
     config.validate()
     
+    # Artifacts downloaded and processed at the same time, shared with the agent's auto-indexing
+    worker_count = config.agent.max_concurrent_requests
+    
     # Initialize clients
     storage_client = StorageClient(config.azure_storage)
     document_processor = DocumentProcessor(config)
     
-    search_client = SearchClient(
-        endpoint=config.azure_search.endpoint,
-        index_name=config.azure_search.index_name,
-        credential=AzureKeyCredential(config.azure_search.api_key)
-    )
-    
     logger.info("Starting artifact indexing...")
     
-    # Get all artifacts from storage
-    artifacts = storage_client.list_artifacts()
-    logger.info(f"Found {len(artifacts)} artifacts to index")
-    
-    indexed_count = 0
+    artifact_queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+    document_queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
     
-    for artifact in artifacts:
+    async with SearchClient(
+        endpoint=config.azure_search.endpoint,
+        index_name=config.azure_search.index_name,
+        credential=AzureKeyCredential(config.azure_search.api_key)
+    ) as search_client, ContainerClient.from_connection_string(
+        config.azure_storage.connection_string,
+        config.azure_storage.container_name
+    ) as container_client:
+        
+        # None disables change detection when the index cannot store content hashes
+        indexed_hashes = None
+        if await asyncio.to_thread(ensure_content_hash_field, config.azure_search):
+            indexed_hashes = await fetch_indexed_hashes(search_client)
+        
+        # lister -> processing workers -> batch uploader
+        uploader = asyncio.create_task(upload_worker(search_client, document_queue))
+        lister = asyncio.create_task(list_worker(
+            storage_client,
+            container_client,
+            artifact_queue,
+            worker_count
+        ))
+        
         try:
-            logger.info(f"Processing: {artifact.blob_name}")
-            
-            # Download and process artifact
-            content = storage_client.download_artifact(artifact.blob_name)
-            processed = document_processor.process(
-                content,
-                artifact.document_type,
-                artifact.blob_name
-            )
-            
-            # Create search document
-            document_id = hashlib.md5(artifact.blob_name.encode()).hexdigest()
-            
-            search_document = {
-                "id": document_id,
-                "blob_name": artifact.blob_name,
-                "content": processed.extracted_text[:50000],  # Limit content size
-                "document_type": artifact.document_type.value,
-                "keywords": processed.keywords,
-                "last_modified": artifact.last_modified.isoformat()
-            }
-            
-            # Upload to search index
-            result = search_client.upload_documents(documents=[search_document])
-            
-            if result[0].succeeded:
-                logger.info(f"✓ Indexed: {artifact.blob_name}")
-                indexed_count += 1
-            else:
-                logger.error(f"✗ Failed to index: {artifact.blob_name}")
-            
-        except Exception as e:
-            logger.error(f"Error processing {artifact.blob_name}: {e}")
-            continue
+            await asyncio.gather(*(
+                process_worker(
+                    artifact_queue,
+                    document_queue,
+                    container_client,
+                    document_processor,
+                    indexed_hashes,
+                    config.azure_storage.max_concurrency
+                )
+                for _ in range(worker_count)
+            ))
+        finally:
+            # Always release the uploader so it flushes what was processed
+            await document_queue.put(None)
+            indexed_count = await uploader
+        
+        # Re-raises a listing failure after the processed artifacts are uploaded
+        listed_count = await lister
     
-    logger.info(f"\nIndexing complete! Indexed {indexed_count}/{len(artifacts)} artifacts")
+    logger.info(f"\nIndexing complete! Indexed {indexed_count}/{listed_count} artifacts")
 
 
 if __name__ == "__main__":
+    install_fast_event_loop()
     asyncio.run(index_artifacts())
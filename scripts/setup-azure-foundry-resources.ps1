@@ -225,6 +225,7 @@ if ($LASTEXITCODE -eq 0) {
             @{ name = "document_type"; type = "Edm.String"; filterable = $true; facetable = $true }
             @{ name = "keywords"; type = "Collection(Edm.String)"; searchable = $true; filterable = $true }
             @{ name = "last_modified"; type = "Edm.DateTimeOffset"; filterable = $true; sortable = $true }
+            @{ name = "content_hash"; type = "Edm.String"; searchable = $false; filterable = $true }
         )
     } | ConvertTo-Json -Depth 10
     
@@ -2,6 +2,8 @@
 Configuration settings for the Orchestrator Agent
 """
 import os
+from functools import lru_cache
+from typing import Optional
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field
 
@@ -20,6 +22,7 @@ class AzureStorageConfig(BaseModel):
     """Azure Storage configuration"""
     connection_string: str = Field(default_factory=lambda: os.getenv("AZURE_STORAGE_CONNECTION_STRING"))
     container_name: str = Field(default_factory=lambda: os.getenv("AZURE_STORAGE_CONTAINER_NAME"))
+    max_concurrency: int = Field(default_factory=lambda: int(os.getenv("AZURE_STORAGE_MAX_CONCURRENCY", "16")))
 
 
 class AzureSearchConfig(BaseModel):
@@ -48,6 +51,10 @@ class AgentConfig(BaseModel):
     log_level: str = Field(default_factory=lambda: os.getenv("LOG_LEVEL", "INFO"))
     max_tokens: int = Field(default_factory=lambda: int(os.getenv("MAX_TOKENS", "4000")))
     temperature: float = Field(default_factory=lambda: float(os.getenv("TEMPERATURE", "0.7")))
+    max_concurrent_requests: int = Field(default_factory=lambda: int(os.getenv("MAX_CONCURRENT_REQUESTS", "16")))
+    document_workers: int = Field(default_factory=lambda: int(os.getenv("DOCUMENT_PROCESSOR_WORKERS", str(os.cpu_count() or 4))))
+    azure_ai_cache_dir: Optional[str] = Field(default_factory=lambda: os.getenv("AZURE_AI_CACHE_DIR") or None)
+    keyword_scan_window: int = Field(default_factory=lambda: int(os.getenv("KEYWORD_SCAN_WINDOW", "262144")))
 
 
 class Config:
@@ -78,3 +85,9 @@ class Config:
             raise ValueError(f"Missing required configuration: {', '.join(missing)}")
         
         return True
+
+
+@lru_cache(maxsize=1)
+def get_config() -> Config:
+    """Get the shared configuration, reading the environment only once"""
+    return Config()
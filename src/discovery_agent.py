@@ -2,18 +2,25 @@
 Discovery Workshop Agent for Azure Landing Zone
 Systematically gathers required information from documents and user input
 """
-import json
-import logging
-import re
+import asyncio
 import hashlib
+import heapq
+import logging
+import os
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Any
+from operator import attrgetter
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Any
+import orjson
 from pydantic import BaseModel, Field
 from semantic_kernel import Kernel
 from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion
 from semantic_kernel.connectors.ai.chat_completion_client_base import ChatCompletionClientBase
 from semantic_kernel.contents.chat_history import ChatHistory
 from azure.search.documents import SearchClient
+from azure.search.documents.aio import SearchIndexingBufferedSender
 from azure.core.credentials import AzureKeyCredential
 
 from src.discovery_framework import (
@@ -23,11 +30,19 @@ from src.discovery_framework import (
     DiscoveryCategory,
     InformationPriority,
     get_questions_by_category,
+    get_questions_by_priority,
     get_critical_questions
 )
 from src.config import Config
 from src.storage_client import StorageClient
-from src.search_client import SearchIndexClient
+from src.search_client import (
+    CONTENT_HASH_FIELD,
+    MAX_INDEXED_CONTENT_CHARS,
+    SearchIndexClient,
+    ensure_content_hash_field,
+    make_content_hash,
+    make_document_id
+)
 from src.document_processor import DocumentProcessor
 from src.models import ProcessedContent
 from src.validators import QuestionValidator, ValidationResult, ValidationSeverity
@@ -35,6 +50,21 @@ from src.export_utils import ReportExporter
 
 logger = logging.getLogger(__name__)
 
+# Maximum documents (best search scores) in the shared context of one category request
+MAX_CATEGORY_CONTEXT_DOCUMENTS = 8
+
+# Question fields exported for each missing question, fetched in one C-level call
+_MISSING_QUESTION_FIELDS = attrgetter('id', 'question', 'category', 'priority', 'help_text', 'examples')
+
+# Report format -> ReportExporter method
+REPORT_EXPORTERS = {
+    'md': ReportExporter.export_to_markdown,
+    'markdown': ReportExporter.export_to_markdown,
+}
+
+# Fingerprints of previous-session answers already uploaded to the search index
+ANSWER_INDEX_MANIFEST = "indexed_answers.manifest"
+
 
 class DiscoverySession(BaseModel):
     """Represents a discovery workshop session"""
@@ -44,6 +74,7 @@ class DiscoverySession(BaseModel):
     documents_analyzed: List[str] = Field(default_factory=list)
     completion_percentage: float = 0.0
     missing_critical_info: List[str] = Field(default_factory=list)
+    answers_version: int = 0  # Bumped whenever answers change, keys derived caches
     
     def get_answered_count(self) -> int:
         """Count answered questions"""
@@ -54,7 +85,8 @@ class DiscoverySession(BaseModel):
         return len(DISCOVERY_QUESTIONS)
     
     def update_completion(self):
-        """Update completion percentage"""
+        """Update completion percentage after answers change"""
+        self.answers_version += 1
         self.completion_percentage = (self.get_answered_count() / self.get_total_count()) * 100
 
 
@@ -71,11 +103,16 @@ class DiscoveryAgent:
         self.document_processor = DocumentProcessor(config)
         self.kernel = self._setup_kernel()
         self.session: Optional[DiscoverySession] = None
+        self._journal_path: Optional[str] = None  # Append-only JSONL of answer changes this session
         self.use_search_index = True  # Flag to enable/disable search optimization
-        self.auto_save_interval = 1  # Auto-save after every answer (changed from 5)
+        self.auto_save_interval = 5  # Full checkpoint every N answers; each answer is journaled in between
         self.confidence_threshold = 0.85  # Auto-accept answers above this threshold
         self.answer_cache = {}  # Cache for validated answers
         self.last_save_time = None  # Track last save for logging
+        self._previous_sessions: Optional[List[Tuple[str, Dict[str, Any]]]] = None  # Parsed previous result files
+        self._checkpoint_executor = ThreadPoolExecutor(max_workers=1)  # Writes checkpoints in order, off the event loop
+        self._derived_cache: Dict[Any, Any] = {}  # Summary/missing info for the current answers version
+        self._derived_for: Optional[Tuple[DiscoverySession, int]] = None
         
     def _setup_kernel(self) -> Kernel:
         """Initialize Semantic Kernel"""
@@ -93,49 +130,75 @@ class DiscoveryAgent:
     async def start_discovery_workshop(self, session_id: str, auto_resume: bool = True) -> DiscoverySession:
         """Start a new discovery workshop session and auto-index artifacts"""
         self.session = DiscoverySession(session_id=session_id)
+        self._journal_path = f"session_{session_id}.jsonl"
+        self._previous_sessions = None  # Rescan result files once per workshop start
         logger.info(f"Started discovery workshop: {session_id}")
         
         # Auto-load latest previous session if enabled
         if auto_resume:
             await self._auto_load_previous_session()
         
-        # Auto-index artifacts if using search
+        # Auto-index artifacts and answers from previous sessions if using search;
+        # both only upload independent documents, so they run concurrently
         if self.use_search_index:
-            await self._auto_index_artifacts()
-            await self._index_previous_answers()  # Index answers from previous sessions
+            await asyncio.gather(
+                self._auto_index_artifacts(),
+                self._index_previous_answers()
+            )
         
         return self.session
     
+    async def _load_previous_sessions(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Find and parse previous discovery result files once (oldest first)"""
+        if self._previous_sessions is None:
+            self._previous_sessions = await asyncio.to_thread(self._read_previous_sessions)
+        return self._previous_sessions
+    
+    @staticmethod
+    def _read_previous_sessions() -> List[Tuple[str, Dict[str, Any]]]:
+        """Read all discovery_results_*.json files, ordered by modification time"""
+        # scandir entries cache their stat result, so sorting costs one stat per file
+        with os.scandir('.') as entries:
+            result_entries = sorted(
+                (
+                    entry for entry in entries
+                    if entry.name.startswith("discovery_results_") and entry.name.endswith(".json")
+                ),
+                key=lambda entry: entry.stat().st_mtime
+            )
+        
+        sessions = []
+        for result_file in (entry.name for entry in result_entries):
+            try:
+                sessions.append((result_file, orjson.loads(Path(result_file).read_bytes())))
+            except Exception as e:
+                logger.warning(f"Failed to read previous session {result_file}: {e}")
+        
+        return sessions
+    
     async def _auto_load_previous_session(self):
         """Automatically load answers from the most recent session"""
         try:
-            import glob
-            import os
-            
-            result_files = glob.glob("discovery_results_*.json")
-            if not result_files:
-                logger.info("No previous session found")
-                return
+            previous_sessions = await self._load_previous_sessions()
+            loaded_answers: Dict[str, DiscoveryAnswer] = {}
+            exported_at = 0.0
             
             # Get the most recent file
-            latest = max(result_files, key=os.path.getctime)
-            logger.info(f"Found previous session: {latest}")
+            if previous_sessions:
+                latest, results = previous_sessions[-1]
+                logger.info(f"Found previous session: {latest}")
+                loaded_answers.update(self._answers_from_results(results))
+                exported_at = os.stat(latest).st_mtime
             
-            with open(latest, 'r', encoding='utf-8') as f:
-                results = json.load(f)
+            # Replay answer changes journaled by sessions interrupted after that export
+            await asyncio.to_thread(self._replay_answer_journals, loaded_answers, exported_at)
+            if not loaded_answers:
+                logger.info("No previous session found")
+                return
             
             # Load all answers into current session
-            loaded_count = 0
-            for answer_data in results.get('answers', []):
-                answer = DiscoveryAnswer(
-                    question_id=answer_data['question_id'],
-                    answer=answer_data['answer'],
-                    source=answer_data['source'],
-                    confidence=answer_data['confidence'],
-                    document_reference=answer_data.get('document_reference')
-                )
-                self.session.answers[answer_data['question_id']] = answer
-                loaded_count += 1
+            self.session.answers.update(loaded_answers)
+            loaded_count = len(loaded_answers)
             
             self.session.update_completion()
             logger.info(f"✓ Auto-loaded {loaded_count} answers from previous session")
@@ -143,95 +206,200 @@ class DiscoveryAgent:
         except Exception as e:
             logger.warning(f"Failed to auto-load previous session: {e}")
     
+    @staticmethod
+    def _answers_from_results(results: Dict[str, Any]) -> Dict[str, DiscoveryAnswer]:
+        """Rebuild answers keyed by question ID from an exported results dict"""
+        # Trusted data from our own exports: skip Pydantic validation
+        return {
+            answer_data['question_id']: DiscoveryAnswer.model_construct(
+                question_id=answer_data['question_id'],
+                answer=answer_data['answer'],
+                source=answer_data['source'],
+                confidence=answer_data['confidence'],
+                document_reference=answer_data.get('document_reference')
+            )
+            for answer_data in results.get('answers', [])
+        }
+    
+    @staticmethod
+    def _replay_answer_journals(answers: Dict[str, DiscoveryAnswer], since: float):
+        """Apply session_*.jsonl answer journals modified after `since` to `answers` (oldest first)"""
+        with os.scandir('.') as entries:
+            journal_entries = sorted(
+                (
+                    entry for entry in entries
+                    if entry.name.startswith("session_") and entry.name.endswith(".jsonl")
+                    and entry.stat().st_mtime > since
+                ),
+                key=lambda entry: entry.stat().st_mtime
+            )
+        
+        for entry in journal_entries:
+            events = []
+            try:
+                for line in Path(entry.path).read_bytes().splitlines():
+                    try:
+                        events.append(orjson.loads(line))
+                    except orjson.JSONDecodeError:
+                        # A line cut short by an interrupted write
+                        logger.warning(f"Skipping incomplete line in {entry.name}")
+            except OSError as e:
+                logger.warning(f"Failed to read answer journal {entry.name}: {e}")
+            
+            # Events apply in order, so a later answer or deletion wins
+            for event in events:
+                if event.get('deleted'):
+                    answers.pop(event['question_id'], None)
+                else:
+                    answers.update(DiscoveryAgent._answers_from_results({'answers': [event]}))
+    
     async def _auto_index_artifacts(self):
         """Automatically index artifacts from blob storage into AI Search"""
         try:
             logger.info("Auto-indexing artifacts from blob storage...")
             
-            # Initialize search client for indexing
+            # Initialize search client for existence checks
             search_client = SearchClient(
                 endpoint=self.config.azure_search.endpoint,
                 index_name=self.config.azure_search.index_name,
                 credential=AzureKeyCredential(self.config.azure_search.api_key)
             )
             
-            # Get all artifacts from storage
-            artifacts = self.storage_client.list_artifacts()
+            # Get all artifacts from storage (the storage and search clients are blocking)
+            artifacts = await asyncio.to_thread(self.storage_client.list_artifacts)
             logger.info(f"Found {len(artifacts)} artifacts to index")
             
-            indexed_count = 0
-            skipped_count = 0
+            # Look up what is already indexed in bulk rather than per artifact
+            document_ids = {
+                artifact.blob_name: make_document_id(artifact.blob_name)
+                for artifact in artifacts
+            }
+            indexed_versions = await asyncio.to_thread(
+                self._get_indexed_versions,
+                search_client,
+                list(document_ids.values())
+            )
+            
+            # Store content hashes so scripts/index_artifacts.py can skip these artifacts
+            write_hashes = await asyncio.to_thread(ensure_content_hash_field, self.config.azure_search)
+            
+            counts = {"indexed": 0, "skipped": 0}
+            
+            def on_progress(action):
+                counts["indexed"] += 1
+            
+            def on_error(action):
+                blob_name = getattr(action, "additional_properties", {}).get("blob_name", "unknown")
+                logger.warning(f"✗ Failed to index: {blob_name}")
+            
+            # Buffered sender batches uploads and handles retries / oversized batches
+            sender = SearchIndexingBufferedSender(
+                endpoint=self.config.azure_search.endpoint,
+                index_name=self.config.azure_search.index_name,
+                credential=AzureKeyCredential(self.config.azure_search.api_key),
+                auto_flush_interval=60,
+                initial_batch_action_count=500,
+                on_progress=on_progress,
+                on_error=on_error
+            )
+            semaphore = asyncio.Semaphore(self.config.agent.max_concurrent_requests)
             
-            for artifact in artifacts:
+            async def index_one(artifact):
+                document_id = document_ids[artifact.blob_name]
+                
+                # Skip if the document was not modified since last index
+                indexed_modified = indexed_versions.get(document_id)
+                if indexed_modified and artifact.last_modified <= indexed_modified:
+                    logger.debug(f"Skipping (already indexed): {artifact.blob_name}")
+                    counts["skipped"] += 1
+                    return
+                
                 try:
-                    # Create document ID from blob name
-                    document_id = hashlib.md5(artifact.blob_name.encode()).hexdigest()
-                    
-                    # Check if already indexed by searching for this ID
-                    try:
-                        existing = search_client.get_document(key=document_id)
-                        # Check if document was modified since last index
-                        if existing and existing.get('last_modified'):
-                            existing_modified = datetime.fromisoformat(existing['last_modified'])
-                            if artifact.last_modified <= existing_modified:
-                                logger.debug(f"Skipping (already indexed): {artifact.blob_name}")
-                                skipped_count += 1
-                                continue
-                    except:
-                        pass  # Document not found, will index it
+                    async with semaphore:
+                        search_document = await asyncio.to_thread(
+                            self._build_artifact_search_document,
+                            artifact,
+                            document_id,
+                            write_hashes
+                        )
                     
-                    logger.info(f"Indexing: {artifact.blob_name}")
-                    
-                    # Download and process artifact
-                    content = self.storage_client.download_artifact(artifact.blob_name)
-                    processed = self.document_processor.process(
-                        content,
-                        artifact.document_type,
-                        artifact.blob_name
-                    )
-                    
-                    # Create search document
-                    search_document = {
-                        "id": document_id,
-                        "blob_name": artifact.blob_name,
-                        "content": processed.extracted_text[:50000],  # Limit content size
-                        "document_type": artifact.document_type.value,
-                        "keywords": processed.keywords,
-                        "last_modified": artifact.last_modified.isoformat()
-                    }
-                    
-                    # Upload to search index
-                    result = search_client.upload_documents(documents=[search_document])
-                    
-                    if result[0].succeeded:
-                        logger.info(f"✓ Indexed: {artifact.blob_name}")
-                        indexed_count += 1
-                    else:
-                        logger.warning(f"✗ Failed to index: {artifact.blob_name}")
+                    await sender.upload_documents(documents=[search_document])
                 
                 except Exception as e:
                     logger.error(f"Error indexing {artifact.blob_name}: {e}")
-                    continue
             
-            logger.info(f"Auto-indexing complete: {indexed_count} indexed, {skipped_count} skipped (already current)")
+            async with sender:
+                await asyncio.gather(*(index_one(artifact) for artifact in artifacts))
+            
+            logger.info(f"Auto-indexing complete: {counts['indexed']} indexed, {counts['skipped']} skipped (already current)")
             
         except Exception as e:
             logger.warning(f"Auto-indexing failed: {e}. Will fall back to direct blob access.")
             self.use_search_index = False
     
+    def _get_indexed_versions(self, search_client: SearchClient, document_ids: List[str]) -> Dict[str, datetime]:
+        """Get last_modified of already-indexed documents, querying up to 1000 IDs at a time (blocking)"""
+        indexed_versions = {}
+        
+        for i in range(0, len(document_ids), 1000):
+            chunk = document_ids[i:i + 1000]
+            id_list = ",".join(chunk)
+            try:
+                results = search_client.search(
+                    search_text="*",
+                    filter=f"search.in(id, '{id_list}')",
+                    select=["id", "last_modified"],
+                    top=len(chunk)
+                )
+                for result in results:
+                    if result.get('last_modified'):
+                        # Search returns DateTimeOffset values with a 'Z' suffix
+                        indexed_versions[result['id']] = datetime.fromisoformat(
+                            result['last_modified'].replace('Z', '+00:00')
+                        )
+            except Exception as e:
+                logger.warning(f"Could not check indexed artifacts, will re-index them: {e}")
+        
+        return indexed_versions
+    
+    def _build_artifact_search_document(self, artifact, document_id: str,
+                                        write_hash: bool = False) -> Dict[str, Any]:
+        """Download and process an artifact into a search document (blocking)"""
+        logger.info(f"Indexing: {artifact.blob_name}")
+        
+        # Download and process artifact
+        content = self.storage_client.download_artifact(artifact.blob_name)
+        processed = self.document_processor.process(
+            content,
+            artifact.document_type,
+            artifact.blob_name,
+            max_chars=MAX_INDEXED_CONTENT_CHARS,
+            include_sheet_data=False  # Only text and keywords are indexed
+        )
+        
+        # Create search document
+        search_document = {
+            "id": document_id,
+            "blob_name": artifact.blob_name,
+            "content": processed.extracted_text,  # Limited to MAX_INDEXED_CONTENT_CHARS by the processor
+            "document_type": artifact.document_type.value,
+            "keywords": processed.keywords,
+            "last_modified": artifact.last_modified.isoformat()
+        }
+        if write_hash:
+            search_document[CONTENT_HASH_FIELD] = make_content_hash(content)
+        return search_document
+    
     async def _index_previous_answers(self):
         """Index answers from previous discovery sessions into search for reference"""
         try:
-            import glob
-            import os
-            
             # Find all previous discovery result files
-            result_files = glob.glob("discovery_results_*.json")
-            if not result_files:
+            previous_sessions = await self._load_previous_sessions()
+            if not previous_sessions:
                 logger.info("No previous sessions found to index")
                 return
             
-            logger.info(f"Indexing answers from {len(result_files)} previous session(s)...")
+            logger.info(f"Indexing answers from {len(previous_sessions)} previous session(s)...")
             
             search_client = SearchClient(
                 endpoint=self.config.azure_search.endpoint,
@@ -239,19 +407,41 @@ class DiscoveryAgent:
                 credential=AzureKeyCredential(self.config.azure_search.api_key)
             )
             
-            indexed_answers = 0
+            # Fingerprints of answers already indexed by earlier runs, limited to
+            # documents still in the index (it may have been recreated or cleared)
+            index_key = f"{self.config.azure_search.endpoint}/{self.config.azure_search.index_name}"
+            manifest = await asyncio.to_thread(self._read_answer_manifest, index_key)
+            if manifest:
+                indexed_versions = await asyncio.to_thread(
+                    self._get_indexed_versions,
+                    search_client,
+                    list(manifest)
+                )
+                manifest = {
+                    document_id: fingerprint
+                    for document_id, fingerprint in manifest.items()
+                    if document_id in indexed_versions
+                }
+            pending = {}  # document_id -> (fingerprint, search_document)
+            skipped_answers = 0
             
-            for result_file in result_files:
+            for result_file, results in previous_sessions:
                 try:
-                    with open(result_file, 'r', encoding='utf-8') as f:
-                        results = json.load(f)
-                    
                     session_id = results.get('session', {}).get('id', 'unknown')
                     answers = results.get('answers', [])
                     
                     for answer_data in answers:
                         # Create a searchable document from the answer
-                        document_id = hashlib.md5(f"{session_id}_{answer_data['question_id']}".encode()).hexdigest()
+                        document_id = make_document_id(f"{session_id}_{answer_data['question_id']}")
+                        
+                        # Skip answers that are unchanged since they were last indexed
+                        fingerprint = hashlib.blake2b(
+                            orjson.dumps(answer_data, option=orjson.OPT_SORT_KEYS),
+                            digest_size=16
+                        ).hexdigest()
+                        if manifest.get(document_id) == fingerprint:
+                            skipped_answers += 1
+                            continue
                         
                         # Build content from question and answer
                         content = f"""
@@ -264,35 +454,80 @@ Source: {answer_data['source']}
 Confidence: {answer_data['confidence']}
 """
                         
-                        search_document = {
+                        pending[document_id] = (fingerprint, {
                             "id": document_id,
                             "blob_name": f"answer_{answer_data['question_id']}_{session_id}.txt",
                             "content": content,
                             "document_type": "text",
                             "keywords": [answer_data['category'], answer_data['priority'], "answer", "discovery"],
                             "last_modified": datetime.now().isoformat()
-                        }
-                        
-                        # Upload to search index
-                        result = search_client.upload_documents(documents=[search_document])
-                        
-                        if result[0].succeeded:
-                            indexed_answers += 1
-                            logger.debug(f"Indexed answer for: {answer_data['question_id']}")
+                        })
                 
                 except Exception as e:
                     logger.warning(f"Failed to index answers from {result_file}: {e}")
                     continue
             
+            # Upload changed answers to search index in batches; the sync client runs
+            # in a worker thread so artifact indexing keeps running alongside
+            indexed_answers = 0
+            documents = [search_document for _, search_document in pending.values()]
+            
+            for i in range(0, len(documents), 500):
+                try:
+                    upload_results = await asyncio.to_thread(
+                        search_client.upload_documents,
+                        documents=documents[i:i + 500]
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to upload previous answers: {e}")
+                    continue
+                
+                for result in upload_results:
+                    if result.succeeded:
+                        manifest[result.key] = pending[result.key][0]
+                        indexed_answers += 1
+            
+            if indexed_answers:
+                await asyncio.to_thread(self._write_answer_manifest, index_key, manifest)
+            
+            logger.debug(f"Skipped {skipped_answers} unchanged previous answers")
             logger.info(f"✓ Indexed {indexed_answers} previous answers for reference")
             
         except Exception as e:
             logger.warning(f"Failed to index previous answers: {e}")
     
-    async def analyze_documents(self) -> Tuple[int, List[str]]:
+    @staticmethod
+    def _read_answer_manifest(index_key: str) -> Dict[str, str]:
+        """Load fingerprints of answers previously indexed into this index"""
+        try:
+            manifest = orjson.loads(Path(ANSWER_INDEX_MANIFEST).read_bytes())
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable answer index manifest: {e}")
+            return {}
+        
+        # A manifest written for another index (or in the old format) says nothing about this one
+        if not isinstance(manifest, dict) or manifest.get('index') != index_key:
+            return {}
+        return manifest.get('answers', {})
+    
+    @staticmethod
+    def _write_answer_manifest(index_key: str, manifest: Dict[str, str]):
+        """Atomically replace the answer index manifest"""
+        tmp_path = f"{ANSWER_INDEX_MANIFEST}.tmp"
+        Path(tmp_path).write_bytes(orjson.dumps({'index': index_key, 'answers': manifest}))
+        os.replace(tmp_path, ANSWER_INDEX_MANIFEST)
+    
+    async def analyze_documents(
+        self,
+        on_progress: Optional[Callable[[int, int, str], None]] = None
+    ) -> Tuple[int, List[str]]:
         """
         Analyze uploaded documents to extract answers
         Uses Azure AI Search for efficient querying when available
+        on_progress is called with (completed, total, item) as each category
+        (search index) or document (blob storage) finishes
         Returns: (answers_found, documents_processed)
         """
         if not self.session:
@@ -301,67 +536,116 @@ Confidence: {answer_data['confidence']}
         # Try search-optimized approach first
         if self.use_search_index:
             try:
-                return await self._analyze_with_search_index()
+                return await self._analyze_with_search_index(on_progress)
             except Exception as e:
                 logger.warning(f"Search index not available: {e}. Falling back to direct blob access.")
                 self.use_search_index = False
         
         # Fallback: Direct blob storage approach
-        return await self._analyze_from_blob_storage()
+        return await self._analyze_from_blob_storage(on_progress)
     
-    async def _analyze_with_search_index(self) -> Tuple[int, List[str]]:
+    async def _analyze_with_search_index(
+        self,
+        on_progress: Optional[Callable[[int, int, str], None]] = None
+    ) -> Tuple[int, List[str]]:
         """
         Optimized document analysis using Azure AI Search
-        Queries only relevant content for each question
+        Queries only relevant content and answers each category in one request
         """
         logger.info("Using Azure AI Search for optimized document analysis...")
         
         answers_found = 0
         documents_used = set()
         
-        # Process questions by category for better context
+        # One extraction call per category, categories run concurrently
+        pending_by_category = {}
         for category in DiscoveryCategory:
-            category_questions = get_questions_by_category(category)
+            pending = [
+                question for question in get_questions_by_category(category)
+                if question.id not in self.session.answers  # Skip already answered
+            ]
+            if pending:
+                pending_by_category[category] = pending
+        
+        semaphore = asyncio.Semaphore(self.config.agent.max_concurrent_requests)
+        
+        async def search_question(question: DiscoveryQuestion) -> List[Dict[str, Any]]:
+            # Build search query from question and help text
+            search_query = f"{question.question} {question.help_text or ''}"
             
-            for question in category_questions:
-                if question.id in self.session.answers:
-                    continue  # Skip already answered
-                
-                try:
-                    # Build search query from question and help text
-                    search_query = f"{question.question} {question.help_text or ''}"
-                    
+            try:
+                async with semaphore:
                     # Semantic search for relevant content
-                    results = self.search_client.search(
+                    return await asyncio.to_thread(
+                        self.search_client.search,
                         query=search_query,
                         top=3,  # Top 3 most relevant documents
                         select=["blob_name", "content", "document_type"]
                     )
-                    
-                    if not results:
-                        continue
-                    
-                    # Extract answer from search results
-                    answer = await self._extract_answer_from_search_results(
-                        question,
-                        results
-                    )
-                    
-                    if answer:
-                        # Smart inference: auto-accept high confidence answers
-                        if answer.confidence >= self.confidence_threshold:
-                            self.session.answers[question.id] = answer
-                            answers_found += 1
-                            documents_used.add(answer.document_reference)
-                            logger.info(f"✓ Auto-answered {question.id} (confidence: {answer.confidence:.0%})")
-                        else:
-                            # Store for user review if confidence is low
-                            self.answer_cache[question.id] = answer
-                            logger.debug(f"Cached low-confidence answer for {question.id} (confidence: {answer.confidence:.0%})")
-                
-                except Exception as e:
-                    logger.error(f"Error searching for {question.id}: {e}")
-                    continue
+            except Exception as e:
+                # One failed query should not drop the rest of the category
+                logger.warning(f"Search failed for {question.id}: {e}")
+                return []
+        
+        async def answer_category(questions: List[DiscoveryQuestion]) -> List[DiscoveryAnswer]:
+            per_question_results = await asyncio.gather(*(search_question(q) for q in questions))
+            
+            # Shared context: union of each question's top results, best hit per document
+            search_results = {}
+            for results in per_question_results:
+                for result in results:
+                    blob_name = result.get('blob_name', 'unknown')
+                    known = search_results.get(blob_name)
+                    if known is None or result.get('search_score', 0) > known.get('search_score', 0):
+                        search_results[blob_name] = result
+            
+            if not search_results:
+                return []
+            
+            # Keep the prompt bounded for large categories
+            context = heapq.nlargest(
+                MAX_CATEGORY_CONTEXT_DOCUMENTS,
+                search_results.values(),
+                key=lambda result: result.get('search_score', 0)
+            )
+            
+            async with semaphore:
+                # Extract answers for the whole category from the shared context
+                return await self._extract_answers_from_search_results(questions, context)
+        
+        categories = list(pending_by_category)
+        completed = 0
+        
+        async def run_category(category: DiscoveryCategory) -> List[DiscoveryAnswer]:
+            nonlocal completed
+            try:
+                return await answer_category(pending_by_category[category])
+            finally:
+                completed += 1
+                if on_progress:
+                    on_progress(completed, len(categories), category.value)
+        
+        category_answers = await asyncio.gather(
+            *(run_category(category) for category in categories),
+            return_exceptions=True
+        )
+        
+        for category, answers in zip(categories, category_answers):
+            if isinstance(answers, Exception):
+                logger.error(f"Error searching for {category.value}: {answers}")
+                continue
+            
+            for answer in answers:
+                # Smart inference: auto-accept high confidence answers
+                if answer.confidence >= self.confidence_threshold:
+                    self.session.answers[answer.question_id] = answer
+                    answers_found += 1
+                    documents_used.add(answer.document_reference)
+                    logger.info(f"✓ Auto-answered {answer.question_id} (confidence: {answer.confidence:.0%})")
+                else:
+                    # Store for user review if confidence is low
+                    self.answer_cache[answer.question_id] = answer
+                    logger.debug(f"Cached low-confidence answer for {answer.question_id} (confidence: {answer.confidence:.0%})")
         
         self.session.documents_analyzed = list(documents_used)
         self.session.update_completion()
@@ -369,7 +653,10 @@ Confidence: {answer_data['confidence']}
         logger.info(f"Extracted {answers_found} answers from {len(documents_used)} documents using search index")
         return answers_found, self.session.documents_analyzed
     
-    async def _analyze_from_blob_storage(self) -> Tuple[int, List[str]]:
+    async def _analyze_from_blob_storage(
+        self,
+        on_progress: Optional[Callable[[int, int, str], None]] = None
+    ) -> Tuple[int, List[str]]:
         """
         Fallback: Analyze documents directly from blob storage
         Used when search index is not available
@@ -384,7 +671,7 @@ Confidence: {answer_data['confidence']}
         logger.info(f"Found {len(artifacts)} documents to analyze")
         answers_found = 0
         
-        for artifact_name in artifacts:
+        for completed, artifact_name in enumerate(artifacts, 1):
             try:
                 logger.info(f"Processing document: {artifact_name}")
                 content = self.storage_client.download_artifact(artifact_name)
@@ -403,46 +690,59 @@ Confidence: {answer_data['confidence']}
                 
             except Exception as e:
                 logger.error(f"Error processing {artifact_name}: {e}")
-                continue
+            finally:
+                if on_progress:
+                    on_progress(completed, len(artifacts), str(artifact_name))
         
         self.session.update_completion()
         return answers_found, self.session.documents_analyzed
     
-    async def _extract_answer_from_search_results(
+    async def _extract_answers_from_search_results(
         self,
-        question: DiscoveryQuestion,
+        questions: List[DiscoveryQuestion],
         search_results: List[Dict[str, Any]]
-    ) -> Optional[DiscoveryAnswer]:
+    ) -> List[DiscoveryAnswer]:
         """
-        Extract answer to a specific question from search results
-        More efficient than processing entire documents
+        Extract answers to a group of related questions from shared search results
+        More efficient than processing entire documents or one question at a time
         """
-        if not search_results:
-            return None
+        if not questions or not search_results:
+            return []
         
-        # Combine relevant content from top results
+        # Combine relevant content from the retrieved documents
         combined_content = "\n\n".join([
             f"Document: {result.get('blob_name', 'unknown')}\n{result.get('content', '')[:2000]}"
-            for result in search_results[:3]
+            for result in search_results
         ])
         
-        prompt = f"""Extract the answer to this specific question from the provided content.
+        questions_text = "\n".join(
+            f"- {q.id}: {q.question}"
+            + (f"\n  CONTEXT: {q.help_text}" if q.help_text else "")
+            + (f"\n  EXAMPLES: {q.examples}" if q.examples else "")
+            for q in questions
+        )
+        
+        prompt = f"""Extract the answers to these specific questions from the provided content.
 
-QUESTION: {question.question}
-CONTEXT: {question.help_text or 'N/A'}
-{f"EXAMPLES: {question.examples}" if question.examples else ""}
+QUESTIONS:
+{questions_text}
 
 RELEVANT CONTENT:
 {combined_content}
 
-TASK: If you find a clear answer, return JSON with:
+TASK: For each question where you find a clear answer, add an entry to the "answers" array of this JSON object:
 {{
-  "answer": "the specific answer text",
-  "confidence": 0.0-1.0,
-  "source_document": "document name where answer was found"
+  "answers": [
+    {{
+      "question_id": "the question ID",
+      "answer": "the specific answer text",
+      "confidence": 0.0-1.0,
+      "source_document": "document name where answer was found"
+    }}
+  ]
 }}
 
-If no clear answer found, return: {{"answer": null}}
+Only include questions with a clear answer. If no answers are found, return: {{"answers": []}}
 """
         
         try:
@@ -452,30 +752,31 @@ If no clear answer found, return: {{"answer": null}}
             
             response = await chat_service.get_chat_message_content(
                 chat_history=chat_history,
-                settings=self.kernel.get_prompt_execution_settings_from_service_id(
-                    service_id=chat_service.service_id
-                )
+                settings=self._json_execution_settings(chat_service)
             )
             
             # Parse response
-            cleaned = self._clean_json_response(str(response))
-            data = json.loads(cleaned)
+            data = self._parse_answer_items(str(response))
             
-            if data.get("answer"):
-                return DiscoveryAnswer(
-                    question_id=question.id,
-                    answer=data["answer"],
+            question_ids = {q.id for q in questions}
+            answers = []
+            for item in data:
+                if item.get("question_id") not in question_ids or not item.get("answer"):
+                    continue
+                answers.append(DiscoveryAnswer(
+                    question_id=item["question_id"],
+                    answer=item["answer"],
                     source="search_index",
-                    confidence=data.get("confidence", 0.8),
-                    document_reference=data.get("source_document", search_results[0].get("blob_name", "unknown")),
+                    confidence=item.get("confidence", 0.8),
+                    document_reference=item.get("source_document", search_results[0].get("blob_name", "unknown")),
                     notes=None
-                )
+                ))
             
-            return None
+            return answers
             
         except Exception as e:
-            logger.error(f"Error extracting answer for {question.id}: {e}")
-            return None
+            logger.error(f"Error extracting answers for {', '.join(q.id for q in questions)}: {e}")
+            return []
     
     async def _extract_answers_from_document(
         self, 
@@ -505,17 +806,19 @@ TASK: Extract answers from the document content. For each question where you fin
 3. Rate your confidence (0.0 to 1.0)
 4. Note the relevant document section
 
-Return ONLY valid JSON array format:
-[
-  {{
-    "question_id": "biz_001",
-    "answer": "Digital transformation and datacenter exit",
-    "confidence": 0.95,
-    "document_reference": "Executive Summary, page 1"
-  }}
-]
+Return ONLY a JSON object in this format:
+{{
+  "answers": [
+    {{
+      "question_id": "biz_001",
+      "answer": "Digital transformation and datacenter exit",
+      "confidence": 0.95,
+      "document_reference": "Executive Summary, page 1"
+    }}
+  ]
+}}
 
-Only include questions where you found clear, relevant information. Return empty array [] if nothing found.
+Only include questions where you found clear, relevant information. Return {{"answers": []}} if nothing found.
 """
         
         try:
@@ -525,14 +828,11 @@ Only include questions where you found clear, relevant information. Return empty
             
             response = await chat_service.get_chat_message_content(
                 chat_history=chat_history,
-                settings=self.kernel.get_prompt_execution_settings_from_service_id(
-                    service_id=chat_service.service_id
-                )
+                settings=self._json_execution_settings(chat_service)
             )
             
-            # Clean and parse JSON response
-            cleaned_response = self._clean_json_response(str(response))
-            extracted_data = json.loads(cleaned_response)
+            # Parse JSON response
+            extracted_data = self._parse_answer_items(str(response))
             
             # Convert to DiscoveryAnswer objects
             answers = []
@@ -556,40 +856,43 @@ Only include questions where you found clear, relevant information. Return empty
             logger.error(f"Error extracting answers: {e}")
             return []
     
-    def _clean_json_response(self, response: str) -> str:
-        """Clean AI response to extract pure JSON"""
-        # Remove markdown code blocks
-        cleaned = re.sub(r'```json\s*', '', response)
-        cleaned = re.sub(r'```\s*', '', cleaned)
-        
-        # Try to extract JSON array
-        match = re.search(r'\[.*\]', cleaned, re.DOTALL)
-        if match:
-            return match.group(0)
-        
-        # Try to extract JSON object
-        match = re.search(r'\{.*\}', cleaned, re.DOTALL)
-        if match:
-            return match.group(0)
-        
-        return cleaned.strip()
+    def _json_execution_settings(self, chat_service: ChatCompletionClientBase):
+        """Build execution settings that put the chat model in JSON mode"""
+        settings_class = chat_service.get_prompt_execution_settings_class()
+        return settings_class(
+            service_id=chat_service.service_id,
+            response_format={"type": "json_object"}
+        )
+    
+    def _parse_answer_items(self, response: str) -> List[Dict[str, Any]]:
+        """Parse the answers array from a JSON-mode AI response"""
+        data = orjson.loads(response.strip())
+        if isinstance(data, dict):
+            return data.get("answers", [])
+        return data
     
     def get_missing_information(self, priority: Optional[InformationPriority] = None) -> List[DiscoveryQuestion]:
         """Get questions that still need answers"""
         if not self.session:
             return []
         
-        missing = []
-        for qid, question in DISCOVERY_QUESTIONS.items():
-            # Filter by priority if specified
-            if priority and question.priority != priority:
-                continue
-            
-            # Check if answered
-            if qid not in self.session.answers:
-                missing.append(question)
+        def compute() -> List[DiscoveryQuestion]:
+            # Only scan the questions of the requested priority
+            questions = get_questions_by_priority(priority) if priority else DISCOVERY_QUESTIONS.values()
+            return [question for question in questions if question.id not in self.session.answers]
         
-        return missing
+        return list(self._derived(("missing", priority), compute))
+    
+    def _derived(self, key: Any, compute):
+        """Memoize a value derived from the session answers until they change"""
+        current = (self.session, self.session.answers_version)
+        if self._derived_for is None or self._derived_for[0] is not current[0] or self._derived_for[1] != current[1]:
+            self._derived_for = current
+            self._derived_cache = {}
+        
+        if key not in self._derived_cache:
+            self._derived_cache[key] = compute()
+        return self._derived_cache[key]
     
     def get_critical_gaps(self) -> List[DiscoveryQuestion]:
         """Get unanswered CRITICAL priority questions"""
@@ -615,6 +918,7 @@ Only include questions where you found clear, relevant information. Return empty
         
         self.session.answers[question.id] = answer
         self.session.update_completion()
+        self._journal_answer(answer)
         
         # Auto-save checkpoint every N answers
         if len(self.session.answers) % self.auto_save_interval == 0:
@@ -622,44 +926,110 @@ Only include questions where you found clear, relevant information. Return empty
         
         return answer, validations
     
-    def _auto_save_checkpoint(self):
-        """Auto-save session checkpoint after every answer"""
+    def accept_cached_answer(self, question_id: str) -> DiscoveryAnswer:
+        """Accept a cached low-confidence answer into the session"""
+        answer = self.answer_cache.pop(question_id)
+        self.session.answers[question_id] = answer
+        self.session.update_completion()
+        self._journal_answer(answer)
+        return answer
+    
+    def delete_answer(self, question_id: str):
+        """Remove an answer from the session"""
+        del self.session.answers[question_id]
+        self.session.update_completion()
+        self._journal_event({"question_id": question_id, "deleted": True})
+    
+    def _journal_answer(self, answer: DiscoveryAnswer) -> Future:
+        """Append one answer to the session journal so an interrupted session can be resumed"""
+        return self._journal_event({
+            "question_id": answer.question_id,
+            "answer": answer.answer,
+            "source": answer.source,
+            "confidence": answer.confidence,
+            "document_reference": answer.document_reference
+        })
+    
+    def _journal_event(self, event: Dict[str, Any]) -> Future:
+        """Append one answer change to the session journal (in the background)"""
+        line = orjson.dumps(event) + b"\n"
+        
+        # Same single worker as checkpoints, so journal lines land in answer order
+        future = self._checkpoint_executor.submit(self._append_journal_line, self._journal_path, line)
+        
+        def on_written(done: Future):
+            if done.exception():
+                logger.warning(f"Failed to journal answer change: {done.exception()}")
+        
+        future.add_done_callback(on_written)
+        return future
+    
+    @staticmethod
+    def _append_journal_line(path: str, line: bytes):
+        """Append a single serialized line to the journal file (blocking)"""
+        with open(path, 'ab') as f:
+            f.write(line)
+    
+    def _auto_save_checkpoint(self) -> Optional[Future]:
+        """Auto-save a full session checkpoint"""
         try:
             checkpoint_file = f"checkpoint_{self.session.session_id}.json"
-            self.export_discovery_results(checkpoint_file)
-            self.last_save_time = datetime.now()
+            answered = len(self.session.answers)
+            completion = self.session.completion_percentage
             
-            # Log every 5 saves to avoid console clutter, but save happens every answer
-            if len(self.session.answers) % 5 == 0:
-                logger.info(f"💾 Auto-saved: {len(self.session.answers)} answers ({self.session.completion_percentage:.1f}% complete)")
+            # Snapshot the session here; serialization and the file write run in the background
+            results = self._build_results()
+            future = self._checkpoint_executor.submit(self._write_results, results, checkpoint_file)
         except Exception as e:
             logger.warning(f"Failed to auto-save checkpoint: {e}")
+            return None
+        
+        def on_saved(done: Future):
+            if done.exception():
+                logger.warning(f"Failed to auto-save checkpoint: {done.exception()}")
+                return
+            self.last_save_time = datetime.now()
+            
+            # Log every 5 answers to avoid console clutter
+            if answered % 5 == 0:
+                logger.info(f"💾 Auto-saved: {answered} answers ({completion:.1f}% complete)")
+        
+        future.add_done_callback(on_saved)
+        return future
     
     def get_discovery_summary(self) -> Dict:
         """Generate summary of discovery session"""
         if not self.session:
             return {}
         
-        # Count by source
-        document_answers = sum(1 for a in self.session.answers.values() if a.source == "document")
-        user_answers = sum(1 for a in self.session.answers.values() if a.source == "user_input")
+        return self._derived("summary", self._compute_discovery_summary)
+    
+    def _compute_discovery_summary(self) -> Dict:
+        """Build the discovery summary for the current answers"""
+        # Count by source, priority and category in a single pass over the answers
+        source_counts = Counter()
+        category_counts = Counter()
+        critical_answered = 0
+        for qid, answer in self.session.answers.items():
+            source_counts[answer.source] += 1
+            question = DISCOVERY_QUESTIONS[qid]
+            category_counts[question.category] += 1
+            if question.priority == InformationPriority.CRITICAL:
+                critical_answered += 1
         
-        # Count by priority
-        critical_answered = sum(
-            1 for qid in self.session.answers.keys()
-            if DISCOVERY_QUESTIONS[qid].priority == InformationPriority.CRITICAL
-        )
+        document_answers = source_counts["document"]
+        user_answers = source_counts["user_input"]
         critical_total = len(get_critical_questions())
         
         # Group by category
         answers_by_category = {}
         for category in DiscoveryCategory:
-            category_questions = get_questions_by_category(category)
-            answered = sum(1 for q in category_questions if q.id in self.session.answers)
+            total = len(get_questions_by_category(category))
+            answered = category_counts[category]
             answers_by_category[category.value] = {
                 "answered": answered,
-                "total": len(category_questions),
-                "percentage": (answered / len(category_questions) * 100) if category_questions else 0
+                "total": total,
+                "percentage": (answered / total * 100) if total else 0
             }
         
         return {
@@ -680,12 +1050,47 @@ Only include questions where you found clear, relevant information. Return empty
             "missing_critical": [q.question for q in self.get_critical_gaps()]
         }
     
-    def export_discovery_results(self, output_path: str):
+    async def export_discovery_results(self, output_path: str):
         """Export discovery results to JSON file"""
+        results = self._build_results()
+        await asyncio.to_thread(self._write_results, results, output_path)
+        logger.info(f"Discovery results exported to {output_path}")
+        
+        # An export that resume will read holds every journaled change, so the journal
+        # can go; removal is queued after pending journal writes
+        if self._journal_path and self._is_resumable_export(output_path):
+            await asyncio.wrap_future(
+                self._checkpoint_executor.submit(self._remove_journal, self._journal_path)
+            )
+    
+    @staticmethod
+    def _is_resumable_export(output_path: str) -> bool:
+        """Whether _read_previous_sessions picks this file up on the next start"""
+        path = Path(output_path)
+        return (
+            path.name.startswith("discovery_results_") and path.name.endswith(".json")
+            and path.resolve().parent == Path.cwd().resolve()
+        )
+    
+    @staticmethod
+    def _remove_journal(path: str):
+        """Delete the session journal if it exists (blocking)"""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    
+    def _build_results(self) -> Dict[str, Any]:
+        """Build the exportable results dict for the current session (shared, do not mutate)"""
         if not self.session:
             raise ValueError("No active discovery session")
         
-        results = {
+        # Reused by every export and checkpoint until the answers change
+        return self._derived("results", self._compute_results)
+    
+    def _compute_results(self) -> Dict[str, Any]:
+        """Assemble session, summary, answers and missing information for export"""
+        return {
             "session": {
                 "id": self.session.session_id,
                 "timestamp": self.session.timestamp.isoformat(),
@@ -695,9 +1100,9 @@ Only include questions where you found clear, relevant information. Return empty
             "answers": [
                 {
                     "question_id": qid,
-                    "question": DISCOVERY_QUESTIONS[qid].question,
-                    "category": DISCOVERY_QUESTIONS[qid].category.value,
-                    "priority": DISCOVERY_QUESTIONS[qid].priority.value,
+                    "question": (question := DISCOVERY_QUESTIONS[qid]).question,
+                    "category": question.category.value,
+                    "priority": question.priority.value,
                     "answer": answer.answer,
                     "source": answer.source,
                     "confidence": answer.confidence,
@@ -707,42 +1112,34 @@ Only include questions where you found clear, relevant information. Return empty
             ],
             "missing_information": [
                 {
-                    "question_id": q.id,
-                    "question": q.question,
-                    "category": q.category.value,
-                    "priority": q.priority.value,
-                    "help_text": q.help_text,
-                    "examples": q.examples
+                    "question_id": qid,
+                    "question": question,
+                    "category": category.value,
+                    "priority": priority.value,
+                    "help_text": help_text,
+                    "examples": examples
                 }
-                for q in self.get_missing_information()
+                for qid, question, category, priority, help_text, examples
+                in map(_MISSING_QUESTION_FIELDS, self.get_missing_information())
             ]
         }
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
-        
-        logger.info(f"Discovery results exported to {output_path}")
+    
+    @staticmethod
+    def _write_results(results: Dict[str, Any], output_path: str):
+        """Serialize results and write them to a JSON file (blocking)"""
+        Path(output_path).write_bytes(orjson.dumps(results, option=orjson.OPT_INDENT_2))
     
     def import_discovery_results(self, input_path: str) -> bool:
         """Import and resume from previous discovery session"""
         try:
-            with open(input_path, 'r', encoding='utf-8') as f:
-                results = json.load(f)
+            results = orjson.loads(Path(input_path).read_bytes())
             
             # Create session from imported data
             session_data = results.get('session', {})
             self.session = DiscoverySession(session_id=session_data.get('id', f"resumed_{datetime.now().strftime('%Y%m%d_%H%M%S')}"))
             
             # Import all answers
-            for answer_data in results.get('answers', []):
-                answer = DiscoveryAnswer(
-                    question_id=answer_data['question_id'],
-                    answer=answer_data['answer'],
-                    source=answer_data['source'],
-                    confidence=answer_data['confidence'],
-                    document_reference=answer_data.get('document_reference')
-                )
-                self.session.answers[answer_data['question_id']] = answer
+            self.session.answers.update(self._answers_from_results(results))
             
             self.session.update_completion()
             logger.info(f"Imported {len(self.session.answers)} answers from {input_path}")
@@ -751,46 +1148,16 @@ Only include questions where you found clear, relevant information. Return empty
             logger.error(f"Failed to import discovery results: {e}")
             return False
     
-    def export_enhanced_report(self, output_path: str, format: str = 'pdf') -> str:
-        """Export enhanced report with multiple formats"""
+    def export_enhanced_report(self, output_path: str, format: str = 'markdown') -> str:
+        """Export enhanced report in the requested format"""
         if not self.session:
             raise ValueError("No active session")
         
         # Get full results
-        results = {
-            "session": {
-                "id": self.session.session_id,
-                "timestamp": self.session.timestamp.isoformat(),
-                "completion": self.session.completion_percentage
-            },
-            "summary": self.get_discovery_summary(),
-            "answers": [
-                {
-                    "question_id": qid,
-                    "question": DISCOVERY_QUESTIONS[qid].question,
-                    "category": DISCOVERY_QUESTIONS[qid].category.value,
-                    "priority": DISCOVERY_QUESTIONS[qid].priority.value,
-                    "answer": answer.answer,
-                    "source": answer.source,
-                    "confidence": answer.confidence,
-                    "document_reference": answer.document_reference
-                }
-                for qid, answer in self.session.answers.items()
-            ],
-            "missing_information": [
-                {
-                    "question_id": q.id,
-                    "question": q.question,
-                    "category": q.category.value,
-                    "priority": q.priority.value,
-                    "help_text": q.help_text,
-                    "examples": q.examples
-                }
-                for q in self.get_missing_information()
-            ]
-        }
+        results = self._build_results()
         
         exporter = ReportExporter(results, self.session.session_id)
         
-        # Only support markdown format
-        return exporter.export_to_markdown(output_path)
+        # Unknown formats fall back to Markdown, the only format implemented so far
+        export = REPORT_EXPORTERS.get(format.lower(), ReportExporter.export_to_markdown)
+        return export(exporter, output_path)
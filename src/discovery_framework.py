@@ -2,8 +2,10 @@
 Azure Landing Zone Discovery Framework
 Defines all required information for successful deployment
 """
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
 from pydantic import BaseModel
 
 
@@ -29,8 +31,9 @@ class InformationPriority(str, Enum):
     LOW = "low"  # Optional, can evolve over time
 
 
-class DiscoveryQuestion(BaseModel):
-    """A single discovery question"""
+@dataclass(slots=True, frozen=True)
+class DiscoveryQuestion:
+    """A single discovery question (static, read-only framework data)"""
     id: str
     category: DiscoveryCategory
     question: str
@@ -40,6 +43,14 @@ class DiscoveryQuestion(BaseModel):
     validation_pattern: Optional[str] = None
     default_value: Optional[str] = None
     related_questions: Optional[List[str]] = None
+    
+    # Display values derived once at construction for the workshop CLI
+    priority_label: str = field(init=False, repr=False, compare=False)
+    display_examples: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, "priority_label", self.priority.value.upper())
+        object.__setattr__(self, "display_examples", tuple(self.examples[:3]) if self.examples else ())
 
 
 class DiscoveryAnswer(BaseModel):
@@ -52,8 +63,8 @@ class DiscoveryAnswer(BaseModel):
     notes: Optional[str] = None
 
 
-# Azure Landing Zone Discovery Framework
-DISCOVERY_QUESTIONS: Dict[str, DiscoveryQuestion] = {
+# Azure Landing Zone Discovery Framework (read-only; the indexes below depend on it)
+DISCOVERY_QUESTIONS: Mapping[str, DiscoveryQuestion] = MappingProxyType({
     
     # BUSINESS CONTEXT
     "biz_001": DiscoveryQuestion(
@@ -455,17 +466,29 @@ DISCOVERY_QUESTIONS: Dict[str, DiscoveryQuestion] = {
         question="What database platforms are needed? (SQL, Cosmos DB, PostgreSQL, MySQL)",
         priority=InformationPriority.HIGH
     ),
+})
+
+
+# DISCOVERY_QUESTIONS is static, so index it once at import time
+_QUESTIONS_BY_CATEGORY: Dict[DiscoveryCategory, List[DiscoveryQuestion]] = {
+    category: [q for q in DISCOVERY_QUESTIONS.values() if q.category == category]
+    for category in DiscoveryCategory
+}
+
+_QUESTIONS_BY_PRIORITY: Dict[InformationPriority, List[DiscoveryQuestion]] = {
+    priority: [q for q in DISCOVERY_QUESTIONS.values() if q.priority == priority]
+    for priority in InformationPriority
 }
 
 
 def get_questions_by_category(category: DiscoveryCategory) -> List[DiscoveryQuestion]:
     """Get all questions for a specific category"""
-    return [q for q in DISCOVERY_QUESTIONS.values() if q.category == category]
+    return list(_QUESTIONS_BY_CATEGORY.get(category, []))
 
 
 def get_questions_by_priority(priority: InformationPriority) -> List[DiscoveryQuestion]:
     """Get all questions of a specific priority"""
-    return [q for q in DISCOVERY_QUESTIONS.values() if q.priority == priority]
+    return list(_QUESTIONS_BY_PRIORITY.get(priority, []))
 
 
 def get_critical_questions() -> List[DiscoveryQuestion]:
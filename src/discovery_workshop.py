@@ -11,23 +11,23 @@ from typing import List, Optional
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, MofNCompleteColumn
 from rich.prompt import Prompt, Confirm
 from rich.markdown import Markdown
+from rich.text import Text
 from rich import box
 
-from src.config import Config
+from src.config import get_config
 from src.discovery_agent import DiscoveryAgent
 from src.discovery_framework import (
     DiscoveryQuestion,
     DiscoveryCategory,
-    InformationPriority,
     get_questions_by_category,
     get_critical_questions,
     DISCOVERY_QUESTIONS
 )
 from src.validators import ValidationSeverity
-from src.interactive_helper import InteractiveHelper
+from src.interactive_helper import InteractiveHelper, PRIORITY_COLORS
 
 console = Console()
 
@@ -36,12 +36,17 @@ class DiscoveryWorkshopCLI:
     """Interactive CLI for Azure Landing Zone Discovery Workshop"""
     
     def __init__(self):
-        self.config = Config()
+        self.config = get_config()
         self.agent = DiscoveryAgent(self.config)
         self.session_id = f"workshop_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         self.last_question = None  # Track last question for editing
         self.answers_this_session = []  # Track answers given this session
+        self._last_progress_state = None  # Counts shown by the last progress render
         self.helper = InteractiveHelper(self.agent)  # Interactive help system
+        self._category_question_ids = {  # Question IDs per category for menu status
+            category: frozenset(q.id for q in get_questions_by_category(category))
+            for category in DiscoveryCategory
+        }
         
         # Register signal handler for graceful shutdown (Ctrl+C)
         signal.signal(signal.SIGINT, self._handle_shutdown)
@@ -129,13 +134,18 @@ Let's get started! 🚀
             with Progress(
                 SpinnerColumn(),
                 TextColumn("[progress.description]{task.description}"),
+                BarColumn(),
+                MofNCompleteColumn(),
                 console=console
             ) as progress:
                 task = progress.add_task("Analyzing documents...", total=None)
                 
-                answers_found, documents = await self.agent.analyze_documents()
+                def on_progress(completed: int, total: int, item: str):
+                    progress.update(task, completed=completed, total=total, description=f"Analyzed {item}")
+                
+                answers_found, documents = await self.agent.analyze_documents(on_progress)
                 
-                progress.update(task, completed=True)
+                progress.update(task, description="Analysis complete")
             
             # Show results
             if documents:
@@ -156,6 +166,13 @@ Let's get started! 🚀
         """Display current discovery progress"""
         summary = self.agent.get_discovery_summary()
         
+        # Skip re-rendering when no answers changed since the last render
+        state = (summary['answered'], summary['critical_questions']['answered'])
+        if state == self._last_progress_state:
+            console.print("[dim]No new answers — progress unchanged[/dim]\n")
+            return
+        self._last_progress_state = state
+        
         # Overall progress
         console.print(Panel(
             f"[bold green]{summary['answered']}/{summary['total_questions']}[/bold green] questions answered "
@@ -205,7 +222,8 @@ Let's get started! 🚀
     async def ask_questions_by_category(self, category: DiscoveryCategory):
         """Ask all missing questions for a specific category"""
         category_questions = get_questions_by_category(category)
-        missing = [q for q in category_questions if q.id not in self.agent.session.answers]
+        answered = self.agent.session.answers
+        missing = [q for q in category_questions if q.id not in answered]
         
         if not missing:
             console.print(f"\n[green]✓[/green] {category.value}: Complete!\n")
@@ -219,106 +237,103 @@ Let's get started! 🚀
     
     async def _ask_single_question(self, question: DiscoveryQuestion, current: int, total: int):
         """Ask a single discovery question with validation and edit capability"""
-        # Question header
-        priority_color = {
-            InformationPriority.CRITICAL: "red",
-            InformationPriority.HIGH: "yellow",
-            InformationPriority.MEDIUM: "cyan",
-            InformationPriority.LOW: "white"
-        }
+        priority_color = PRIORITY_COLORS[question.priority]
         
-        console.print(f"[{priority_color[question.priority]}]({current}/{total}) "
-                     f"[{question.priority.value.upper()}][/{priority_color[question.priority]}]")
-        console.print(f"[bold]{question.question}[/bold]")
-        
-        # Help text
-        if question.help_text:
-            console.print(f"[dim]{question.help_text}[/dim]")
-        
-        # Examples
-        if question.examples:
-            console.print("\n[dim]Examples:[/dim]")
-            for example in question.examples[:3]:  # Show max 3 examples
-                console.print(f"  [dim]• {example}[/dim]")
-        
-        # Check if we have a cached low-confidence answer
-        cached = self.agent.answer_cache.get(question.id)
-        if cached:
-            console.print(f"\n[yellow]AI found a potential answer (confidence: {cached.confidence:.0%}):[/yellow]")
-            console.print(f"[dim]\"{cached.answer}\"[/dim]")
-            console.print(f"[dim]Source: {cached.document_reference}[/dim]")
+        # Re-ask in a loop (help commands, edits, invalid answers) rather than recursing
+        while True:
+            # Question header
+            console.print(f"[{priority_color}]({current}/{total}) "
+                         f"[{question.priority_label}][/{priority_color}]")
+            console.print(f"[bold]{question.question}[/bold]")
             
-            if Confirm.ask("Accept this answer?", default=True):
-                # Accept cached answer
-                self.agent.session.answers[question.id] = cached
-                del self.agent.answer_cache[question.id]
-                console.print("[green]✓[/green] Accepted\n")
-                self.last_question = question
-                return
-            else:
-                console.print("[yellow]Provide your own answer below:[/yellow]")
-        
-        # Get answer
-        console.print()
-        answer = Prompt.ask("Your answer (or 'skip' to skip, 'e' to edit last, '?' for help)", default="")
-        
-        # Handle interactive commands
-        if answer.startswith('?'):
-            if self.helper.process_command(answer):
-                # Command was processed, re-ask the question
-                await self._ask_single_question(question, current, total)
-                return
-        
-        # Handle edit last answer
-        if answer.lower() == 'e' and self.last_question:
-            await self._edit_last_answer()
-            # Re-ask current question
-            await self._ask_single_question(question, current, total)
-            return
-        
-        if answer and answer.strip() and answer.lower() != 'skip':
-            # Record answer with validation
-            _, validations = await self.agent.ask_user_question(question, answer.strip())
+            # Help text
+            if question.help_text:
+                console.print(f"[dim]{question.help_text}[/dim]")
             
-            # Check for validation errors
-            has_errors = any(v.severity == ValidationSeverity.ERROR for v in validations)
+            # Examples
+            if question.display_examples:
+                console.print("\n[dim]Examples:[/dim]")
+                for example in question.display_examples:  # Show max 3 examples
+                    console.print(f"  [dim]• {example}[/dim]")
             
-            # Display validation results
-            if validations:
-                self._display_validations(validations)
+            # Check if we have a cached low-confidence answer
+            cached = self.agent.answer_cache.get(question.id)
+            if cached:
+                console.print(f"\n[yellow]AI found a potential answer (confidence: {cached.confidence:.0%}):[/yellow]")
+                console.print(f"[dim]\"{cached.answer}\"[/dim]")
+                console.print(f"[dim]Source: {cached.document_reference}[/dim]")
+                
+                if Confirm.ask("Accept this answer?", default=True):
+                    # Accept cached answer
+                    self.agent.accept_cached_answer(question.id)
+                    console.print("[green]✓[/green] Accepted\n")
+                    self.last_question = question
+                    return
+                else:
+                    console.print("[yellow]Provide your own answer below:[/yellow]")
             
-            # If validation errors, re-ask the question
-            if has_errors:
-                console.print("[yellow]Please provide a valid answer.\n[/yellow]")
-                await self._ask_single_question(question, current, total)
-                return
+            # Get answer
+            console.print()
+            answer = Prompt.ask("Your answer (or 'skip' to skip, 'e' to edit last, '?' for help)", default="")
             
-            # Track for editing
-            self.last_question = question
-            self.answers_this_session.append((question, answer.strip()))
+            # Handle interactive commands
+            if answer.startswith('?'):
+                if self.helper.process_command(answer):
+                    # Command was processed, re-ask the question
+                    continue
             
-            console.print("[green]✓[/green] Recorded\n")
-        else:
-            console.print("[yellow]⊘[/yellow] Skipped\n")
+            # Handle edit last answer
+            if answer.lower() == 'e' and self.last_question:
+                await self._edit_last_answer()
+                # Re-ask current question
+                continue
+            
+            if answer and answer.strip() and answer.lower() != 'skip':
+                # Record answer with validation
+                _, validations = await self.agent.ask_user_question(question, answer.strip())
+                
+                # Check for validation errors
+                has_errors = any(v.severity == ValidationSeverity.ERROR for v in validations)
+                
+                # Display validation results
+                if validations:
+                    self._display_validations(validations)
+                
+                # If validation errors, re-ask the question
+                if has_errors:
+                    console.print("[yellow]Please provide a valid answer.\n[/yellow]")
+                    continue
+                
+                # Track for editing
+                self.last_question = question
+                self.answers_this_session.append((question, answer.strip()))
+                
+                console.print("[green]✓[/green] Recorded\n")
+            else:
+                console.print("[yellow]⊘[/yellow] Skipped\n")
+            return
     
     def _display_validations(self, validations):
         """Display validation results to user"""
+        # Collect all lines and render them with a single print
+        lines = []
         for validation in validations:
             if validation.severity == ValidationSeverity.SUCCESS:
-                console.print(f"[green]✓[/green] {validation.message}")
+                lines.append(f"[green]✓[/green] {validation.message}")
             elif validation.severity == ValidationSeverity.INFO:
-                console.print(f"[blue]ℹ[/blue] {validation.message}")
+                lines.append(f"[blue]ℹ[/blue] {validation.message}")
                 if validation.recommendation:
-                    console.print(f"  [dim]{validation.recommendation}[/dim]")
+                    lines.append(f"  [dim]{validation.recommendation}[/dim]")
             elif validation.severity == ValidationSeverity.WARNING:
-                console.print(f"[yellow]⚠[/yellow] {validation.message}")
+                lines.append(f"[yellow]⚠[/yellow] {validation.message}")
                 if validation.recommendation:
-                    console.print(f"  [dim]Recommendation: {validation.recommendation}[/dim]")
+                    lines.append(f"  [dim]Recommendation: {validation.recommendation}[/dim]")
             elif validation.severity == ValidationSeverity.ERROR:
-                console.print(f"[red]✗[/red] {validation.message}")
+                lines.append(f"[red]✗[/red] {validation.message}")
                 if validation.recommendation:
-                    console.print(f"  [dim]Fix: {validation.recommendation}[/dim]")
-        console.print()
+                    lines.append(f"  [dim]Fix: {validation.recommendation}[/dim]")
+        lines.append("")
+        console.print("\n".join(lines))
     
     async def _edit_last_answer(self):
         """Edit the last answer given"""
@@ -361,10 +376,11 @@ Let's get started! 🚀
             table.add_column("Questions", justify="right")
             table.add_column("Status", justify="center")
             
+            answered_ids = self.agent.session.answers.keys()
             for i, category in enumerate(categories, 1):
-                category_questions = get_questions_by_category(category)
-                answered = sum(1 for q in category_questions if q.id in self.agent.session.answers)
-                total = len(category_questions)
+                question_ids = self._category_question_ids[category]
+                answered = len(answered_ids & question_ids)
+                total = len(question_ids)
                 
                 status = "✓" if answered == total else f"{answered}/{total}"
                 status_color = "green" if answered == total else "yellow"
@@ -425,41 +441,78 @@ Let's get started! 🚀
     
     async def review_and_edit_answers(self):
         """Allow user to review and edit answers before export"""
-        if not Confirm.ask("\nWould you like to review/edit your answers?", default=False):
-            return
-        
         console.print("\n[cyan]--- Answer Review ---[/cyan]\n")
         
-        # Show all answers with edit option
-        answers = list(self.agent.session.answers.items())
+        # Show all answers once; only the selected ones get follow-up prompts
+        session_answers = self.agent.session.answers
+        answers = list(session_answers.items())
+        
+        table = Table(title="Recorded Answers", box=box.ROUNDED)
+        table.add_column("#", style="cyan", width=3)
+        table.add_column("Question", style="bold")
+        table.add_column("Answer", style="cyan")
+        table.add_column("Source", style="dim")
         
         for idx, (qid, answer) in enumerate(answers, 1):
-            question = DISCOVERY_QUESTIONS[qid]
-            
-            console.print(f"\n[{idx}/{len(answers)}] [bold]{question.question}[/bold]")
-            console.print(f"Answer: [cyan]{answer.answer}[/cyan]")
-            console.print(f"Source: [dim]{answer.source}[/dim]")
+            # User-entered answers may contain literal brackets; Text keeps them out of markup parsing
+            table.add_row(str(idx), DISCOVERY_QUESTIONS[qid].question, Text(answer.answer), answer.source)
+        
+        console.print(table)
+        console.print("\n[dim]Enter numbers to edit (e.g. 3,7,12), 'd:' and numbers to delete (e.g. d:3,5), "
+                      "or press Enter to finish[/dim]")
+        
+        while True:
+            selection = Prompt.ask("Selection", default="").strip()
+            if not selection:
+                break
             
-            choice = Prompt.ask("[e]dit, [d]elete, [n]ext", default="n", choices=["e", "d", "n"])
+            delete = selection.lower().startswith('d:')
+            indices = self._parse_selection(selection[2:] if delete else selection, len(answers))
+            if indices is None:
+                console.print(f"[red]Please enter numbers between 1 and {len(answers)}[/red]")
+                continue
             
-            if choice == 'e':
+            for idx in indices:
+                qid = answers[idx - 1][0]
+                question = DISCOVERY_QUESTIONS[qid]
+                answer = session_answers.get(qid)
+                if answer is None:
+                    continue  # Deleted earlier in this review
+                
+                console.print(f"\n[{idx}/{len(answers)}] [bold]{question.question}[/bold]")
+                console.print(f"Answer: [cyan]{answer.answer}[/cyan]")
+                
+                if delete:
+                    if Confirm.ask("Delete this answer?", default=False):
+                        self.agent.delete_answer(qid)
+                        console.print("[yellow]✓[/yellow] Deleted")
+                    continue
+                
                 new_answer = Prompt.ask("New answer", default=answer.answer)
                 if new_answer != answer.answer:
                     _, validations = await self.agent.ask_user_question(question, new_answer)
                     console.print("[green]✓[/green] Updated")
                     if validations:
                         self._display_validations(validations)
-            elif choice == 'd':
-                if Confirm.ask("Delete this answer?", default=False):
-                    del self.agent.session.answers[qid]
-                    console.print("[yellow]✓[/yellow] Deleted")
         
         console.print("\n[green]Review complete[/green]\n")
     
-    def export_results(self):
+    @staticmethod
+    def _parse_selection(selection: str, count: int) -> Optional[List[int]]:
+        """Parse a comma-separated list of 1-based indices; None if any is invalid"""
+        try:
+            indices = sorted({int(part) for part in selection.split(',') if part.strip()})
+        except ValueError:
+            return None
+        
+        if not indices or indices[0] < 1 or indices[-1] > count:
+            return None
+        return indices
+    
+    async def export_results(self):
         """Export discovery results"""
         output_file = f"discovery_results_{self.session_id}.json"
-        self.agent.export_discovery_results(output_file)
+        await self.agent.export_discovery_results(output_file)
         console.print(f"\n[green]✓[/green] Results exported to: [cyan]{output_file}[/cyan]")
         console.print("\n[dim]This file contains all gathered information and can be used for:[/dim]")
         console.print("[dim]  • Azure Landing Zone design[/dim]")
@@ -508,16 +561,8 @@ Let's get started! 🚀
             # Step 4: Final summary
             self.show_final_summary()
             
-            # Review and edit
-            await self.review_and_edit_answers()
-            
-            # Export results
-            if Confirm.ask("Export discovery results?", default=True):
-                self.export_results()
-                
-                # Offer enhanced exports
-                if Confirm.ask("\nGenerate professional reports (PDF/Word/Excel)?", default=False):
-                    await self.export_enhanced_reports()
+            # Step 5: Review, export and reports, selected with a single prompt
+            await self.run_final_actions()
             
             console.print("\n[bold green]Thank you for completing the discovery workshop![/bold green] 🙏\n")
             
@@ -527,6 +572,31 @@ Let's get started! 🚀
             console.print(f"\n[red]Error during workshop: {str(e).replace('[', '').replace(']', '')}[/red]")
             logging.exception("Workshop error")
     
+    async def run_final_actions(self):
+        """Ask once which post-workshop actions to run, then run them in order"""
+        actions = [
+            ("Review/edit answers", self.review_and_edit_answers),
+            ("Export discovery results", self.export_results),
+            ("Generate reports", self.export_enhanced_reports),
+        ]
+        
+        console.print("\n[bold cyan]Final Steps[/bold cyan]")
+        for i, (label, _) in enumerate(actions, 1):
+            console.print(f"  [cyan]{i}[/cyan]. {label}")
+        
+        while True:
+            selection = Prompt.ask("Select actions (comma-separated, 'n' for none)", default="2")
+            if selection.strip().lower() == 'n':
+                return
+            
+            indices = self._parse_selection(selection, len(actions))
+            if indices is not None:
+                break
+            console.print(f"[red]Please enter numbers between 1 and {len(actions)}[/red]")
+        
+        for idx in indices:
+            await actions[idx - 1][1]()
+    
     async def export_enhanced_reports(self):
         """Export enhanced reports in Markdown format"""
         console.print("\n[cyan]Generating reports...[/cyan]\n")
@@ -1,30 +1,51 @@
 """
 Document processor for extracting and normalizing content from various formats
 Enhanced with Azure AI Document Intelligence and Azure AI Vision
+
+Format parsers (PyPDF2, python-docx, python-pptx, openpyxl, Pillow, lxml) and the Azure AI
+service SDKs are imported by the methods that use them, so importing the agent does
+not load them all.
 """
+import hashlib
 import io
 import logging
 import base64
-from typing import Dict, Any, Optional
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
-from PyPDF2 import PdfReader
-from docx import Document
-from pptx import Presentation
-from PIL import Image
-import openpyxl
-
 from azure.core.credentials import AzureKeyCredential
-from azure.ai.documentintelligence import DocumentIntelligenceClient
-from azure.ai.documentintelligence.models import AnalyzeDocumentRequest
-from azure.ai.vision.imageanalysis import ImageAnalysisClient
-from azure.ai.vision.imageanalysis.models import VisualFeatures
 
 from src.models import DocumentType, ProcessedContent
 from src.vision_analyzer import VisionAnalyzer
 
 logger = logging.getLogger(__name__)
 
+# Azure-related keywords tagged on processed documents
+AZURE_KEYWORDS = (
+    "subscription", "resource group", "virtual network", "vnet",
+    "subnet", "nsg", "security", "compliance", "governance",
+    "landing zone", "management group", "policy", "rbac",
+    "storage account", "key vault", "application gateway",
+    "load balancer", "firewall", "vpn", "expressroute"
+)
+# Finds every keyword occurrence (overlaps included, via the lookahead) in one scan
+_AZURE_KEYWORDS_RE = re.compile("(?=(" + "|".join(map(re.escape, AZURE_KEYWORDS)) + "))")
+# Images above either limit are downsampled before upload; Azure AI Vision analyzes
+# at most this resolution anyway
+VISION_MAX_DIMENSION = 4200
+VISION_MAX_UPLOAD_BYTES = 4 * 1024 * 1024
+# Cached Document Intelligence / AI Vision results older than this are re-analyzed and pruned
+AZURE_RESULT_CACHE_TTL = 30 * 24 * 3600
+# Analysis settings; both are part of the result cache key
+DOCUMENT_INTELLIGENCE_MODEL = "prebuilt-layout"
+VISION_FEATURES = ("read", "caption")
+
 
 class DocumentProcessor:
     """Processes and extracts content from different document types"""
@@ -40,6 +61,13 @@ class DocumentProcessor:
         self.doc_intelligence_client = None
         self.vision_client = None
         self.vision_analyzer = None
+        self.max_workers = config.agent.document_workers if config else (os.cpu_count() or 4)
+        self.max_concurrent_requests = config.agent.max_concurrent_requests if config else 16
+        cache_dir = config.agent.azure_ai_cache_dir if config else None
+        self.result_cache_dir = Path(cache_dir) if cache_dir else None  # Opt-in cache of Azure AI results
+        if self.result_cache_dir is not None:
+            self._prune_result_cache()
+        self.keyword_scan_window = config.agent.keyword_scan_window if config else 262144  # 0 scans all text
         
         # Initialize GPT-4 Vision analyzer if OpenAI is configured
         if config:
@@ -50,13 +78,17 @@ class DocumentProcessor:
                 logger.warning(f"Failed to initialize GPT-4 Vision: {e}")
         
         # Initialize Azure Document Intelligence if configured
+        self._http_session = None
         if config and hasattr(config, 'azure_document_intelligence'):
             doc_config = config.azure_document_intelligence
             if doc_config.enabled and doc_config.endpoint and doc_config.api_key:
                 try:
+                    from azure.ai.documentintelligence import DocumentIntelligenceClient
+                    
                     self.doc_intelligence_client = DocumentIntelligenceClient(
                         endpoint=doc_config.endpoint,
-                        credential=AzureKeyCredential(doc_config.api_key)
+                        credential=AzureKeyCredential(doc_config.api_key),
+                        transport=self._pooled_transport()
                     )
                     logger.info("Azure Document Intelligence enabled")
                 except Exception as e:
@@ -67,15 +99,37 @@ class DocumentProcessor:
             vision_config = config.azure_vision
             if vision_config.enabled and vision_config.endpoint and vision_config.api_key:
                 try:
+                    from azure.ai.vision.imageanalysis import ImageAnalysisClient
+                    
                     self.vision_client = ImageAnalysisClient(
                         endpoint=vision_config.endpoint,
-                        credential=AzureKeyCredential(vision_config.api_key)
+                        credential=AzureKeyCredential(vision_config.api_key),
+                        transport=self._pooled_transport()
                     )
                     logger.info("Azure AI Vision enabled")
                 except Exception as e:
                     logger.warning(f"Failed to initialize Azure AI Vision: {e}")
     
-    def process(self, content: bytes, document_type: DocumentType, artifact_name: str) -> ProcessedContent:
+    def _pooled_transport(self):
+        """Create a requests transport on a connection pool shared by the sync Azure AI clients"""
+        import requests
+        from requests.adapters import HTTPAdapter
+        from azure.core.pipeline.transport import RequestsTransport
+        
+        # Auto-indexing and scripts/index_artifacts.py each call process() from up to
+        # max_concurrent_requests threads (16 by default); the default pool keeps only 10
+        if self._http_session is None:
+            pool_size = self.max_concurrent_requests
+            self._http_session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            self._http_session.mount("https://", adapter)
+            self._http_session.mount("http://", adapter)
+        
+        # Clients must not close the shared session when they are closed
+        return RequestsTransport(session=self._http_session, session_owner=False)
+    
+    def process(self, content: bytes, document_type: DocumentType, artifact_name: str,
+                max_chars: Optional[int] = None, include_sheet_data: bool = True) -> ProcessedContent:
         """
         Process document based on type
         
@@ -83,24 +137,36 @@ class DocumentProcessor:
             content: Raw document bytes
             document_type: Type of document
             artifact_name: Name of the artifact
+            max_chars: Optional limit on extracted text length; page/slide/paragraph
+                based extractors stop reading once it is reached
+            include_sheet_data: Keep spreadsheet cell values in structured_data["sheets"];
+                callers that only need the text can skip building them
             
         Returns:
             ProcessedContent with extracted information
         """
         processors = {
-            DocumentType.PDF: self._process_pdf,
-            DocumentType.DOCX: self._process_docx,
-            DocumentType.PPTX: self._process_pptx,
-            DocumentType.XLSX: self._process_xlsx,
+            DocumentType.PDF: partial(self._process_pdf, max_chars=max_chars),
+            DocumentType.DOCX: partial(self._process_docx, max_chars=max_chars),
+            DocumentType.PPTX: partial(self._process_pptx, max_chars=max_chars),
+            DocumentType.XLSX: partial(self._process_xlsx, include_sheet_data=include_sheet_data),
             DocumentType.VSDX: self._process_vsdx,
             DocumentType.IMAGE: self._process_image,
-            DocumentType.TEXT: self._process_text,
+            DocumentType.TEXT: partial(self._process_text, max_chars=max_chars),
         }
         
         processor = processors.get(document_type, self._process_unknown)
-        
+        return self._run_processor(processor, content, document_type, artifact_name, max_chars)
+    
+    @staticmethod
+    def _run_processor(processor, content: bytes, document_type: DocumentType, artifact_name: str,
+                       max_chars: Optional[int] = None) -> ProcessedContent:
+        """Run a processor, enforcing max_chars and turning failures into an error result"""
         try:
-            return processor(content, artifact_name)
+            processed = processor(content, artifact_name)
+            if max_chars is not None and len(processed.extracted_text) > max_chars:
+                processed.extracted_text = processed.extracted_text[:max_chars]
+            return processed
         except Exception as e:
             logger.error(f"Error processing {artifact_name}: {e}")
             return ProcessedContent(
@@ -110,7 +176,8 @@ class DocumentProcessor:
                 confidence_score=0.0
             )
     
-    def _process_pdf(self, content: bytes, artifact_name: str) -> ProcessedContent:
+    def _process_pdf(self, content: bytes, artifact_name: str,
+                     max_chars: Optional[int] = None) -> ProcessedContent:
         """Extract text from PDF using Document Intelligence or fallback to PyPDF2"""
         # Try Document Intelligence first for better quality
         if self.doc_intelligence_client:
@@ -119,13 +186,20 @@ class DocumentProcessor:
             except Exception as e:
                 logger.warning(f"Document Intelligence failed for {artifact_name}, using fallback: {e}")
         
-        # Fallback to PyPDF2
+        return self._process_pdf_local(content, artifact_name, max_chars)
+    
+    def _process_pdf_local(self, content: bytes, artifact_name: str,
+                           max_chars: Optional[int] = None) -> ProcessedContent:
+        """Extract text from PDF with PyPDF2"""
+        from PyPDF2 import PdfReader
+        
         text_parts = []
         sections = []
         
         pdf_file = io.BytesIO(content)
         reader = PdfReader(pdf_file)
         
+        extracted_chars = 0
         for i, page in enumerate(reader.pages):
             page_text = page.extract_text()
             text_parts.append(page_text)
@@ -134,6 +208,11 @@ class DocumentProcessor:
                 "number": i + 1,
                 "content": page_text
             })
+            
+            # Skip extracting the remaining pages once the limit is reached
+            extracted_chars += len(page_text) + 2
+            if max_chars is not None and extracted_chars >= max_chars:
+                break
         
         full_text = "\n\n".join(text_parts)
         
@@ -146,24 +225,36 @@ class DocumentProcessor:
             keywords=self._extract_keywords(full_text)
         )
     
-    def _process_docx(self, content: bytes, artifact_name: str) -> ProcessedContent:
+    def _process_docx(self, content: bytes, artifact_name: str,
+                      max_chars: Optional[int] = None) -> ProcessedContent:
         """Extract text from DOCX"""
+        from docx import Document
+        
         doc_file = io.BytesIO(content)
         doc = Document(doc_file)
         
-        paragraphs = []
+        text = io.StringIO()
         sections = []
+        paragraph_count = 0
         
         for i, para in enumerate(doc.paragraphs):
-            if para.text.strip():
-                paragraphs.append(para.text)
+            # para.text re-joins the paragraph's runs on every access, so read it once
+            para_text = para.text
+            if para_text.strip():
+                if paragraph_count:
+                    text.write("\n\n")
+                text.write(para_text)
+                paragraph_count += 1
                 sections.append({
                     "type": "paragraph",
                     "number": i + 1,
-                    "content": para.text
+                    "content": para_text
                 })
+                
+                if max_chars is not None and text.tell() >= max_chars:
+                    break
         
-        full_text = "\n\n".join(paragraphs)
+        full_text = text.getvalue()
         
         # Extract tables if any
         tables_data = []
@@ -179,18 +270,22 @@ class DocumentProcessor:
             document_type=DocumentType.DOCX,
             extracted_text=full_text,
             sections=sections,
-            structured_data={"paragraph_count": len(paragraphs), "table_count": len(tables_data)},
+            structured_data={"paragraph_count": paragraph_count, "table_count": len(tables_data)},
             keywords=self._extract_keywords(full_text)
         )
     
-    def _process_pptx(self, content: bytes, artifact_name: str) -> ProcessedContent:
+    def _process_pptx(self, content: bytes, artifact_name: str,
+                      max_chars: Optional[int] = None) -> ProcessedContent:
         """Extract text from PowerPoint"""
+        from pptx import Presentation
+        
         ppt_file = io.BytesIO(content)
         prs = Presentation(ppt_file)
         
         text_parts = []
         sections = []
         
+        extracted_chars = 0
         for i, slide in enumerate(prs.slides):
             slide_text = []
             for shape in slide.shapes:
@@ -205,6 +300,10 @@ class DocumentProcessor:
                 "number": i + 1,
                 "content": slide_content
             })
+            
+            extracted_chars += len(slide_content) + 2
+            if max_chars is not None and extracted_chars >= max_chars:
+                break
         
         full_text = "\n\n".join(text_parts)
         
@@ -226,25 +325,33 @@ class DocumentProcessor:
             except Exception as e:
                 logger.warning(f"Azure AI Vision failed for {artifact_name}, using fallback: {e}")
         
-        # Fallback to basic image info
-        image_file = io.BytesIO(content)
-        img = Image.open(image_file)
+        return self._process_image_metadata(content, artifact_name)
+    
+    def _process_image_metadata(self, content: bytes, artifact_name: str) -> ProcessedContent:
+        """Describe an image by its metadata only (no OCR)"""
+        width, height, image_format = self._peek_image_metadata(content)
         
         return ProcessedContent(
             artifact_name=artifact_name,
             document_type=DocumentType.IMAGE,
             extracted_text="[Image content - OCR not available. Enable Azure AI Vision for text extraction]",
             structured_data={
-                "width": img.width,
-                "height": img.height,
-                "format": img.format
+                "width": width,
+                "height": height,
+                "format": image_format
             },
             confidence_score=0.5
         )
     
-    def _process_text(self, content: bytes, artifact_name: str) -> ProcessedContent:
+    def _process_text(self, content: bytes, artifact_name: str,
+                      max_chars: Optional[int] = None) -> ProcessedContent:
         """Process plain text file"""
+        # UTF-8 needs at most 4 bytes per character, so only decode what can be kept
+        if max_chars is not None:
+            content = content[:max_chars * 4]
         text = content.decode('utf-8', errors='ignore')
+        if max_chars is not None:
+            text = text[:max_chars]
         
         return ProcessedContent(
             artifact_name=artifact_name,
@@ -262,59 +369,86 @@ class DocumentProcessor:
             confidence_score=0.0
         )
     
-    def _process_xlsx(self, content: bytes, artifact_name: str) -> ProcessedContent:
+    def _process_xlsx(self, content: bytes, artifact_name: str,
+                      include_sheet_data: bool = True) -> ProcessedContent:
         """Extract text and data from Excel files"""
+        # Try Document Intelligence first for better table extraction
+        if self.doc_intelligence_client:
+            try:
+                return self._process_with_document_intelligence(content, artifact_name, DocumentType.XLSX)
+            except Exception as e:
+                logger.warning(f"Document Intelligence failed for Excel, using openpyxl: {e}")
+        
+        return self._process_xlsx_local(content, artifact_name, include_sheet_data)
+    
+    def _process_xlsx_local(self, content: bytes, artifact_name: str,
+                            include_sheet_data: bool = True) -> ProcessedContent:
+        """Extract text and data from Excel files with openpyxl"""
         try:
-            # Try Document Intelligence first for better table extraction
-            if self.doc_intelligence_client:
-                try:
-                    return self._process_with_document_intelligence(content, artifact_name, DocumentType.XLSX)
-                except Exception as e:
-                    logger.warning(f"Document Intelligence failed for Excel, using openpyxl: {e}")
+            import openpyxl
             
-            # Fallback to openpyxl
+            # Read-only mode streams rows from the archive instead of loading every cell up front;
+            # external workbook links are never followed, so don't load them either
             xlsx_file = io.BytesIO(content)
-            workbook = openpyxl.load_workbook(xlsx_file, data_only=True)
+            workbook = openpyxl.load_workbook(xlsx_file, read_only=True, data_only=True, keep_links=False)
             
             text_parts = []
             sections = []
             all_data = []
+            to_str = str  # Local lookup in the per-cell loop
             
-            for sheet in workbook.worksheets:
-                sheet_data = []
-                sheet_text = []
-                
-                for row in sheet.iter_rows(values_only=True):
-                    row_data = [str(cell) if cell is not None else "" for cell in row]
-                    if any(row_data):  # Skip empty rows
-                        sheet_data.append(row_data)
-                        sheet_text.append(" | ".join(row_data))
+            try:
+                for sheet in workbook.worksheets:
+                    sheet_data = []
+                    sheet_text = io.StringIO()
+                    row_count = 0
+                    
+                    # Write each row straight into the sheet's text buffer
+                    for row in sheet.iter_rows(values_only=True):
+                        # Text cells are already str; only other values need converting
+                        row_data = [
+                            "" if cell is None else cell if cell.__class__ is str else to_str(cell)
+                            for cell in row
+                        ]
+                        if any(row_data):  # Skip empty rows
+                            if include_sheet_data:
+                                sheet_data.append(row_data)
+                            if row_count:
+                                sheet_text.write("\n")
+                            sheet_text.write(" | ".join(row_data))
+                            row_count += 1
+                    
+                    if row_count:
+                        sheet_content = sheet_text.getvalue()
+                        text_parts.append(f"Sheet: {sheet.title}\n{sheet_content}")
+                        sections.append({
+                            "type": "worksheet",
+                            "name": sheet.title,
+                            "content": sheet_content,
+                            "row_count": row_count
+                        })
+                        if include_sheet_data:
+                            all_data.append({
+                                "sheet": sheet.title,
+                                "data": sheet_data
+                            })
                 
-                if sheet_text:
-                    sheet_content = "\n".join(sheet_text)
-                    text_parts.append(f"Sheet: {sheet.title}\n{sheet_content}")
-                    sections.append({
-                        "type": "worksheet",
-                        "name": sheet.title,
-                        "content": sheet_content,
-                        "row_count": len(sheet_data)
-                    })
-                    all_data.append({
-                        "sheet": sheet.title,
-                        "data": sheet_data
-                    })
+                sheet_count = len(workbook.worksheets)
+            finally:
+                workbook.close()
             
             full_text = "\n\n".join(text_parts)
             
+            structured_data = {"sheet_count": sheet_count}
+            if include_sheet_data:
+                structured_data["sheets"] = all_data
+            
             return ProcessedContent(
                 artifact_name=artifact_name,
                 document_type=DocumentType.XLSX,
                 extracted_text=full_text,
                 sections=sections,
-                structured_data={
-                    "sheet_count": len(workbook.worksheets),
-                    "sheets": all_data
-                },
+                structured_data=structured_data,
                 keywords=self._extract_keywords(full_text)
             )
         except Exception as e:
@@ -330,25 +464,22 @@ class DocumentProcessor:
         """Process Visio diagrams (basic text extraction from XML)"""
         try:
             import zipfile
-            import xml.etree.ElementTree as ET
             
             # VSDX is a ZIP file containing XML
             vsdx_file = io.BytesIO(content)
             text_parts = []
             
             with zipfile.ZipFile(vsdx_file, 'r') as zip_ref:
-                # Extract text from pages
-                for file_name in zip_ref.namelist():
-                    if file_name.startswith('visio/pages/page') and file_name.endswith('.xml'):
-                        xml_content = zip_ref.read(file_name)
-                        try:
-                            root = ET.fromstring(xml_content)
-                            # Extract text from all text elements
-                            for text_elem in root.iter():
-                                if text_elem.text and text_elem.text.strip():
-                                    text_parts.append(text_elem.text.strip())
-                        except ET.ParseError:
-                            continue
+                pages = [
+                    file_name for file_name in zip_ref.namelist()
+                    if file_name.startswith('visio/pages/page') and file_name.endswith('.xml')
+                ]
+                
+                # Extract text from pages in parallel (ZipFile serializes reads of the shared file)
+                if pages:
+                    with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pages))) as executor:
+                        for page_text in executor.map(partial(self._vsdx_page_text, zip_ref), pages):
+                            text_parts.extend(page_text)
             
             full_text = "\n".join(text_parts) if text_parts else "[No text extracted from Visio diagram]"
             
@@ -369,165 +500,283 @@ class DocumentProcessor:
                 confidence_score=0.0
             )
     
+    @staticmethod
+    def _vsdx_page_text(zip_ref, file_name: str) -> List[str]:
+        """Extract all non-blank text of one Visio page XML, in document order"""
+        from lxml import etree
+        
+        # Uploaded files are untrusted: never expand entities or fetch external resources
+        parser = etree.XMLParser(resolve_entities=False, no_network=True)
+        try:
+            root = etree.fromstring(zip_ref.read(file_name), parser)
+        except etree.XMLSyntaxError:
+            return []
+        
+        return [text.strip() for text in root.xpath("//text()[normalize-space()]")]
+    
     def _process_with_document_intelligence(self, content: bytes, artifact_name: str, 
                                            doc_type: DocumentType) -> ProcessedContent:
         """Process document using Azure Document Intelligence for superior extraction"""
+        from azure.ai.documentintelligence.models import AnalyzeDocumentRequest
+        
+        cache_key = f"di|{DOCUMENT_INTELLIGENCE_MODEL}|{doc_type.value}"
+        cache_path, cached = self._cached_result(cache_key, content, artifact_name)
+        if cached is not None:
+            return cached
+        
         try:
             # Analyze document with layout model
             poller = self.doc_intelligence_client.begin_analyze_document(
-                "prebuilt-layout",
+                DOCUMENT_INTELLIGENCE_MODEL,
                 AnalyzeDocumentRequest(bytes_source=content)
             )
-            result = poller.result()
-            
-            # Extract text with layout preserved
-            full_text = result.content if hasattr(result, 'content') else ""
-            
-            # Extract tables
-            tables_data = []
-            if hasattr(result, 'tables'):
-                for table in result.tables:
-                    table_data = {
-                        "row_count": table.row_count,
-                        "column_count": table.column_count,
-                        "cells": []
-                    }
-                    for cell in table.cells:
-                        table_data["cells"].append({
-                            "content": cell.content,
-                            "row_index": cell.row_index,
-                            "column_index": cell.column_index
-                        })
-                    tables_data.append(table_data)
-            
-            # Extract sections
-            sections = []
-            if hasattr(result, 'paragraphs'):
-                for i, para in enumerate(result.paragraphs):
-                    sections.append({
-                        "type": "paragraph",
-                        "number": i + 1,
-                        "content": para.content,
-                        "role": para.role if hasattr(para, 'role') else None
-                    })
-            
-            return ProcessedContent(
-                artifact_name=artifact_name,
-                document_type=doc_type,
-                extracted_text=full_text,
-                sections=sections,
-                structured_data={
-                    "table_count": len(tables_data),
-                    "tables": tables_data,
-                    "page_count": len(result.pages) if hasattr(result, 'pages') else 0,
-                    "processor": "Azure Document Intelligence"
-                },
-                keywords=self._extract_keywords(full_text),
-                confidence_score=0.95
-            )
+            processed = self._document_intelligence_content(poller.result(), artifact_name, doc_type)
+            return self._cache_result(cache_path, processed)
         except Exception as e:
             logger.error(f"Document Intelligence processing failed: {e}")
             raise
     
+    def _document_intelligence_content(self, result, artifact_name: str,
+                                       doc_type: DocumentType) -> ProcessedContent:
+        """Convert a Document Intelligence layout result into ProcessedContent"""
+        # Extract text with layout preserved
+        full_text = result.content if hasattr(result, 'content') else ""
+        
+        # Extract tables
+        tables_data = []
+        if hasattr(result, 'tables'):
+            for table in result.tables:
+                table_data = {
+                    "row_count": table.row_count,
+                    "column_count": table.column_count,
+                    "cells": []
+                }
+                for cell in table.cells:
+                    table_data["cells"].append({
+                        "content": cell.content,
+                        "row_index": cell.row_index,
+                        "column_index": cell.column_index
+                    })
+                tables_data.append(table_data)
+        
+        # Extract sections
+        sections = []
+        if hasattr(result, 'paragraphs'):
+            for i, para in enumerate(result.paragraphs):
+                sections.append({
+                    "type": "paragraph",
+                    "number": i + 1,
+                    "content": para.content,
+                    "role": para.role if hasattr(para, 'role') else None
+                })
+        
+        return ProcessedContent(
+            artifact_name=artifact_name,
+            document_type=doc_type,
+            extracted_text=full_text,
+            sections=sections,
+            structured_data={
+                "table_count": len(tables_data),
+                "tables": tables_data,
+                "page_count": len(result.pages) if hasattr(result, 'pages') else 0,
+                "processor": "Azure Document Intelligence"
+            },
+            keywords=self._extract_keywords(full_text),
+            confidence_score=0.95
+        )
+    
     def _process_with_vision_ocr(self, content: bytes, artifact_name: str) -> ProcessedContent:
         """Process image using Azure AI Vision OCR and GPT-4 Vision analysis"""
+        # GPT-4 Vision output depends on the deployment; downsampling on the upload size limit
+        gpt_deployment = self.config.azure_openai.deployment_name if self.vision_analyzer else None
+        cache_key = f"vision|{','.join(VISION_FEATURES)}|{gpt_deployment}|{VISION_MAX_DIMENSION}"
+        cache_path, cached = self._cached_result(cache_key, content, artifact_name)
+        if cached is not None:
+            return cached
+        
         try:
-            text_parts = []
-            structured_data = {}
+            upload = self._downsample_for_vision(content)
             
             # Step 1: Try Azure AI Vision OCR for text extraction
+            ocr_result = None
             if self.vision_client:
-                result = self.vision_client.analyze(
-                    image_data=content,
-                    visual_features=[VisualFeatures.READ, VisualFeatures.CAPTION]
-                )
-                
-                # Extract text from OCR
-                if hasattr(result, 'read') and result.read:
-                    for block in result.read.blocks:
-                        for line in block.lines:
-                            text_parts.append(line.text)
+                from azure.ai.vision.imageanalysis.models import VisualFeatures
                 
-                # Get image description
-                if hasattr(result, 'caption') and result.caption:
-                    structured_data["caption"] = result.caption.text
+                ocr_result = self.vision_client.analyze(
+                    image_data=upload,
+                    visual_features=[VisualFeatures(feature) for feature in VISION_FEATURES]
+                )
             
-            # Step 2: Use GPT-4 Vision for deeper analysis (diagrams, architecture)
-            vision_analysis = ""
-            if self.vision_analyzer:
-                try:
-                    # Determine analysis type based on file name
-                    analysis_type = "general"
-                    name_lower = artifact_name.lower()
-                    if any(term in name_lower for term in ["architecture", "diagram", "design"]):
-                        analysis_type = "architecture"
-                    elif any(term in name_lower for term in ["network", "topology", "vnet"]):
-                        analysis_type = "network"
-                    elif any(term in name_lower for term in ["workflow", "process", "flow"]):
-                        analysis_type = "workflow"
-                    elif any(term in name_lower for term in ["whiteboard", "notes", "sketch"]):
-                        # For whiteboards, extract text
-                        vision_analysis = self.vision_analyzer.extract_text_from_whiteboard(content)
-                    else:
-                        # General diagram analysis
-                        result = self.vision_analyzer.analyze_diagram(content, analysis_type)
-                        if result.get("success"):
-                            vision_analysis = result.get("analysis", "")
-                            structured_data["vision_confidence"] = result.get("confidence")
-                
-                except Exception as e:
-                    logger.warning(f"GPT-4 Vision analysis failed: {e}")
+            return self._cache_result(cache_path, self._image_content(content, artifact_name, ocr_result, upload))
+        except Exception as e:
+            logger.error(f"Image processing failed: {e}")
+            raise
+    
+    def _prune_result_cache(self):
+        """Delete cached results older than AZURE_RESULT_CACHE_TTL"""
+        cutoff = time.time() - AZURE_RESULT_CACHE_TTL
+        try:
+            with os.scandir(self.result_cache_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".json") and entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to prune Azure AI result cache: {e}")
+    
+    def _cached_result(self, cache_key: str, content: bytes,
+                       artifact_name: str) -> Tuple[Optional[Path], Optional[ProcessedContent]]:
+        """Look up a cached Azure AI result for this exact content (cache path, cached result or None)"""
+        if self.result_cache_dir is None:
+            return None, None
+        
+        # The key (service, model, features) is hashed with the content so changed settings miss
+        hasher = hashlib.blake2b(cache_key.encode(), digest_size=20)
+        hasher.update(content)
+        cache_path = self.result_cache_dir / f"{hasher.hexdigest()}.json"
+        try:
+            if time.time() - cache_path.stat().st_mtime > AZURE_RESULT_CACHE_TTL:
+                cache_path.unlink(missing_ok=True)
+                return cache_path, None
+            cached = ProcessedContent.model_validate_json(cache_path.read_bytes())
+        except FileNotFoundError:
+            return cache_path, None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cached result {cache_path.name}: {e}")
+            return cache_path, None
+        
+        logger.debug(f"Using cached Azure AI result for {artifact_name}")
+        cached.artifact_name = artifact_name
+        return cache_path, cached
+    
+    @staticmethod
+    def _cache_result(cache_path: Optional[Path], processed: ProcessedContent) -> ProcessedContent:
+        """Store an Azure AI result under its cache path (if caching is enabled) and return it"""
+        if cache_path is not None:
+            try:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                # Write then rename so concurrent readers never see a partial file
+                temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+                temp_path.write_text(processed.model_dump_json(), encoding='utf-8')
+                temp_path.replace(cache_path)
+            except OSError as e:
+                logger.warning(f"Failed to cache result {cache_path.name}: {e}")
+        return processed
+    
+    @staticmethod
+    def _peek_image_metadata(content: bytes) -> Tuple[int, int, Optional[str]]:
+        """Read width, height and format from the image header without decoding pixels"""
+        from PIL import Image
+        
+        # Image.open is lazy; nothing calls load(), so only the header is parsed
+        with Image.open(io.BytesIO(content)) as img:
+            return img.width, img.height, img.format
+    
+    @staticmethod
+    def _downsample_for_vision(content: bytes) -> bytes:
+        """Shrink an oversized image to VISION_MAX_DIMENSION as JPEG; smaller images pass through"""
+        from PIL import Image
+        
+        with Image.open(io.BytesIO(content)) as img:
+            if len(content) <= VISION_MAX_UPLOAD_BYTES and max(img.size) <= VISION_MAX_DIMENSION:
+                return content
             
-            # Combine OCR text and Vision analysis
-            full_text_parts = []
-            if text_parts:
-                full_text_parts.append("=== Extracted Text ===\n" + "\n".join(text_parts))
-            if vision_analysis:
-                full_text_parts.append("=== Visual Analysis ===\n" + vision_analysis)
+            img.thumbnail((VISION_MAX_DIMENSION, VISION_MAX_DIMENSION), Image.Resampling.LANCZOS)
             
-            full_text = "\n\n".join(full_text_parts) if full_text_parts else "[No text detected in image]"
+            # JPEG has no alpha: flatten transparent diagrams onto white, not the default black
+            if img.mode in ("RGBA", "LA") or "transparency" in img.info:
+                rgba = img.convert("RGBA")
+                flattened = Image.new("RGBA", rgba.size, (255, 255, 255, 255))
+                flattened.alpha_composite(rgba)
+                rgb = flattened.convert("RGB")
+            else:
+                rgb = img.convert("RGB")
             
-            # Get image metadata
-            image_file = io.BytesIO(content)
-            img = Image.open(image_file)
+            buffer = io.BytesIO()
+            rgb.save(buffer, format="JPEG", quality=85, optimize=True)
+        
+        logger.debug(f"Downsampled image for upload: {len(content)} -> {buffer.tell()} bytes")
+        return buffer.getvalue()
+    
+    def _image_content(self, content: bytes, artifact_name: str, ocr_result=None,
+                       upload: Optional[bytes] = None) -> ProcessedContent:
+        """Combine an Azure AI Vision OCR result with GPT-4 Vision analysis and image metadata"""
+        # An unreadable image fails here, before the GPT-4 Vision call
+        width, height, image_format = self._peek_image_metadata(content)
+        
+        text_parts = []
+        structured_data = {}
+        
+        if ocr_result is not None:
+            # Extract text from OCR
+            if hasattr(ocr_result, 'read') and ocr_result.read:
+                for block in ocr_result.read.blocks:
+                    for line in block.lines:
+                        text_parts.append(line.text)
             
-            structured_data.update({
-                "width": img.width,
-                "height": img.height,
-                "format": img.format,
-                "text_blocks_found": len(text_parts),
-                "processor": "Azure AI Vision + GPT-4 Vision" if vision_analysis else "Azure AI Vision"
-            })
+            # Get image description
+            if hasattr(ocr_result, 'caption') and ocr_result.caption:
+                structured_data["caption"] = ocr_result.caption.text
+        
+        # Step 2: Use GPT-4 Vision for deeper analysis (diagrams, architecture)
+        vision_analysis = ""
+        if self.vision_analyzer:
+            try:
+                # Determine analysis type based on file name
+                analysis_type = "general"
+                name_lower = artifact_name.lower()
+                if any(term in name_lower for term in ["architecture", "diagram", "design"]):
+                    analysis_type = "architecture"
+                elif any(term in name_lower for term in ["network", "topology", "vnet"]):
+                    analysis_type = "network"
+                elif any(term in name_lower for term in ["workflow", "process", "flow"]):
+                    analysis_type = "workflow"
+                elif any(term in name_lower for term in ["whiteboard", "notes", "sketch"]):
+                    # For whiteboards, extract text
+                    vision_analysis = self.vision_analyzer.extract_text_from_whiteboard(upload or content)
+                else:
+                    # General diagram analysis
+                    result = self.vision_analyzer.analyze_diagram(upload or content, analysis_type)
+                    if result.get("success"):
+                        vision_analysis = result.get("analysis", "")
+                        structured_data["vision_confidence"] = result.get("confidence")
             
-            return ProcessedContent(
-                artifact_name=artifact_name,
-                document_type=DocumentType.IMAGE,
-                extracted_text=full_text,
-                structured_data=structured_data,
-                keywords=self._extract_keywords(full_text),
-                confidence_score=0.95 if vision_analysis else 0.9
-            )
-        except Exception as e:
-            logger.error(f"Image processing failed: {e}")
-            raise
+            except Exception as e:
+                logger.warning(f"GPT-4 Vision analysis failed: {e}")
+        
+        # Combine OCR text and Vision analysis
+        full_text_parts = []
+        if text_parts:
+            full_text_parts.append("=== Extracted Text ===\n" + "\n".join(text_parts))
+        if vision_analysis:
+            full_text_parts.append("=== Visual Analysis ===\n" + vision_analysis)
+        
+        full_text = "\n\n".join(full_text_parts) if full_text_parts else "[No text detected in image]"
+        
+        structured_data.update({
+            "width": width,
+            "height": height,
+            "format": image_format,
+            "text_blocks_found": len(text_parts),
+            "processor": "Azure AI Vision + GPT-4 Vision" if vision_analysis else "Azure AI Vision"
+        })
+        
+        return ProcessedContent(
+            artifact_name=artifact_name,
+            document_type=DocumentType.IMAGE,
+            extracted_text=full_text,
+            structured_data=structured_data,
+            keywords=self._extract_keywords(full_text),
+            confidence_score=0.95 if vision_analysis else 0.9
+        )
     
     def _extract_keywords(self, text: str) -> list:
         """Simple keyword extraction (can be enhanced with NLP)"""
         # Basic implementation - can be improved with Azure AI Language
-        keywords = []
-        
-        # Azure-related keywords
-        azure_keywords = [
-            "subscription", "resource group", "virtual network", "vnet",
-            "subnet", "nsg", "security", "compliance", "governance",
-            "landing zone", "management group", "policy", "rbac",
-            "storage account", "key vault", "application gateway",
-            "load balancer", "firewall", "vpn", "expressroute"
-        ]
-        
-        text_lower = text.lower()
-        for keyword in azure_keywords:
-            if keyword in text_lower:
-                keywords.append(keyword)
-        
-        return list(set(keywords))
+        # On very large texts only scan the head and tail; the glossary terms repeat throughout
+        window = self.keyword_scan_window
+        if window and len(text) > 2 * window:
+            text = text[:window] + "\n" + text[-window:]
+        
+        return list(set(_AZURE_KEYWORDS_RE.findall(text.lower())))
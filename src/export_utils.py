@@ -8,6 +8,29 @@ from typing import Dict, List, Optional
 from pathlib import Path
 
 
+MARKDOWN_HEADER = """# Azure Landing Zone Discovery Report
+
+**Session ID:** {session_id}  
+**Generated:** {generated}  
+**Completion:** {completion:.1f}%
+
+---
+
+## Executive Summary
+
+- **Total Questions:** {answered}/{total_questions}
+- **Documents Analyzed:** {documents_analyzed}
+- **Critical Questions Answered:** {critical_answered}/{critical_total}
+
+---
+
+## Discovery Findings
+
+"""
+
+MARKDOWN_FOOTER = "\n---\n\n*This report was generated by Azure Landing Zone Discovery Agent*\n"
+
+
 class ReportExporter:
     """Export discovery results to JSON and Markdown formats"""
     
@@ -20,8 +43,7 @@ class ReportExporter:
         """Export to Markdown format"""
         md_content = self._generate_markdown()
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(md_content)
+        Path(output_path).write_text(md_content, encoding='utf-8')
         
         return output_path
     
@@ -30,66 +52,55 @@ class ReportExporter:
         summary = self.results.get('summary', {})
         answers = self.results.get('answers', [])
         missing = self.results.get('missing_information', [])
+        critical = summary.get('critical_questions', {})
         
-        md = f"""# Azure Landing Zone Discovery Report
-
-**Session ID:** {self.session_id}  
-**Generated:** {self.timestamp.strftime('%B %d, %Y at %I:%M %p')}  
-**Completion:** {summary.get('completion_percentage', 0):.1f}%
-
----
-
-## Executive Summary
-
-- **Total Questions:** {summary.get('answered', 0)}/{summary.get('total_questions', 0)}
-- **Documents Analyzed:** {summary.get('documents_analyzed', 0)}
-- **Critical Questions Answered:** {summary.get('critical_questions', {}).get('answered', 0)}/{summary.get('critical_questions', {}).get('total', 0)}
-
----
-
-## Discovery Findings
-
-"""
+        parts = [MARKDOWN_HEADER.format(
+            session_id=self.session_id,
+            generated=self.timestamp.strftime('%B %d, %Y at %I:%M %p'),
+            completion=summary.get('completion_percentage', 0),
+            answered=summary.get('answered', 0),
+            total_questions=summary.get('total_questions', 0),
+            documents_analyzed=summary.get('documents_analyzed', 0),
+            critical_answered=critical.get('answered', 0),
+            critical_total=critical.get('total', 0)
+        )]
         
         # Group answers by category
         by_category = {}
         for answer in answers:
-            cat = answer['category']
-            if cat not in by_category:
-                by_category[cat] = []
-            by_category[cat].append(answer)
+            by_category.setdefault(answer['category'], []).append(answer)
         
         # Write each category
         for category, items in by_category.items():
-            md += f"\n### {category}\n\n"
-            for item in items:
-                md += f"**Q: {item['question']}**  \n"
-                md += f"A: {item['answer']}  \n"
-                md += f"*Source: {item['source']} | Confidence: {item['confidence']:.0%}*\n\n"
+            parts.append(f"\n### {category}\n\n")
+            parts.extend(
+                f"**Q: {item['question']}**  \n"
+                f"A: {item['answer']}  \n"
+                f"*Source: {item['source']} | Confidence: {item['confidence']:.0%}*\n\n"
+                for item in items
+            )
         
         # Missing information
         if missing:
-            md += "\n---\n\n## Missing Information\n\n"
-            md += "The following information is still needed:\n\n"
+            parts.append("\n---\n\n## Missing Information\n\n")
+            parts.append("The following information is still needed:\n\n")
             
             critical_missing = [m for m in missing if m['priority'] == 'critical']
             other_missing = [m for m in missing if m['priority'] != 'critical']
             
             if critical_missing:
-                md += "### Critical Items\n\n"
+                parts.append("### Critical Items\n\n")
                 for item in critical_missing:
-                    md += f"- **{item['question']}**\n"
+                    parts.append(f"- **{item['question']}**\n")
                     if item.get('help_text'):
-                        md += f"  - _{item['help_text']}_\n"
-                md += "\n"
+                        parts.append(f"  - _{item['help_text']}_\n")
+                parts.append("\n")
             
             if other_missing:
-                md += "### Optional Items\n\n"
-                for item in other_missing[:10]:  # Limit to 10
-                    md += f"- {item['question']}\n"
-                md += "\n"
+                parts.append("### Optional Items\n\n")
+                parts.extend(f"- {item['question']}\n" for item in other_missing[:10])  # Limit to 10
+                parts.append("\n")
         
-        md += "\n---\n\n"
-        md += "*This report was generated by Azure Landing Zone Discovery Agent*\n"
+        parts.append(MARKDOWN_FOOTER)
         
-        return md
+        return "".join(parts)
@@ -20,6 +20,14 @@ from src.validators import AzureValidator
 
 console = Console()
 
+# Rich color used to display each question priority
+PRIORITY_COLORS = {
+    InformationPriority.CRITICAL: "red",
+    InformationPriority.HIGH: "yellow",
+    InformationPriority.MEDIUM: "cyan",
+    InformationPriority.LOW: "white"
+}
+
 
 class InteractiveHelper:
     """Interactive help system for workshop"""
@@ -70,19 +78,14 @@ class InteractiveHelper:
             console.print(f"\n[bold]{category.value}[/bold] ({len(questions)} questions)")
             
             for q in questions:
-                priority_color = {
-                    InformationPriority.CRITICAL: "red",
-                    InformationPriority.HIGH: "yellow",
-                    InformationPriority.MEDIUM: "cyan",
-                    InformationPriority.LOW: "white"
-                }[q.priority]
+                priority_color = PRIORITY_COLORS[q.priority]
                 
                 status = ""
                 if self.agent and self.agent.session:
                     if q.id in self.agent.session.answers:
                         status = " [green]✓[/green]"
                 
-                console.print(f"  [{priority_color}]{q.priority.value.upper()}[/{priority_color}] {q.question}{status}")
+                console.print(f"  [{priority_color}]{q.priority_label}[/{priority_color}] {q.question}{status}")
         
         console.print()
     
@@ -130,14 +133,9 @@ class InteractiveHelper:
                         if q.id in self.agent.session.answers:
                             status = " [green]✓[/green]"
                     
-                    priority_color = {
-                        InformationPriority.CRITICAL: "red",
-                        InformationPriority.HIGH: "yellow",
-                        InformationPriority.MEDIUM: "cyan",
-                        InformationPriority.LOW: "white"
-                    }[q.priority]
+                    priority_color = PRIORITY_COLORS[q.priority]
                     
-                    console.print(f"[{priority_color}]{q.priority.value.upper()}[/{priority_color}] {q.question}{status}")
+                    console.print(f"[{priority_color}]{q.priority_label}[/{priority_color}] {q.question}{status}")
                     if q.help_text:
                         console.print(f"  [dim]{q.help_text}[/dim]")
                     console.print()
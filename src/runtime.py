@@ -0,0 +1,18 @@
+"""
+Runtime helpers shared by the command-line entry points
+"""
+import asyncio
+import sys
+
+
+def install_fast_event_loop():
+    """Use a libuv-based event loop (uvloop/winloop) when one is installed"""
+    try:
+        if sys.platform == "win32":
+            import winloop as fast_loop
+        else:
+            import uvloop as fast_loop
+    except ImportError:
+        return
+    
+    asyncio.set_event_loop_policy(fast_loop.EventLoopPolicy())
@@ -1,9 +1,13 @@
 """
 Azure AI Search client for querying indexed artifacts
 """
+import hashlib
 import logging
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 from azure.search.documents import SearchClient
+from azure.search.documents.indexes import SearchIndexClient as IndexAdminClient
+from azure.search.documents.indexes.models import SearchFieldDataType, SimpleField
 from azure.core.credentials import AzureKeyCredential
 from azure.core.exceptions import AzureError
 
@@ -11,6 +15,53 @@ from src.config import AzureSearchConfig
 
 logger = logging.getLogger(__name__)
 
+# Maximum characters of extracted text stored per indexed document
+MAX_INDEXED_CONTENT_CHARS = 50000
+# Index field holding a hash of the artifact bytes, used to skip unchanged artifacts
+CONTENT_HASH_FIELD = "content_hash"
+
+
+@lru_cache(maxsize=4096)
+def make_document_id(key: str) -> str:
+    """
+    Build a search document ID from a stable key (blob name, answer key)
+    
+    MD5 is kept so IDs match documents already in existing indexes;
+    it is used only as a key, not for security.
+    """
+    return hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()
+
+
+def make_content_hash(content: bytes) -> str:
+    """Hash artifact bytes for the content_hash index field"""
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def ensure_content_hash_field(config: AzureSearchConfig) -> bool:
+    """
+    Make sure the index has the content_hash field, adding it to indexes created without it
+    
+    Returns False when the field is unavailable; callers then neither write nor compare hashes.
+    """
+    try:
+        with IndexAdminClient(config.endpoint, AzureKeyCredential(config.api_key)) as index_client:
+            index = index_client.get_index(config.index_name)
+            if any(field.name == CONTENT_HASH_FIELD for field in index.fields):
+                return True
+            
+            # Adding a field is an in-place update; existing documents get null
+            index.fields.append(SimpleField(
+                name=CONTENT_HASH_FIELD,
+                type=SearchFieldDataType.String,
+                filterable=True
+            ))
+            index_client.create_or_update_index(index)
+            logger.info(f"Added {CONTENT_HASH_FIELD} field to index {config.index_name}")
+            return True
+    except AzureError as e:
+        logger.warning(f"Index has no {CONTENT_HASH_FIELD} field, unchanged artifacts will be re-indexed: {e}")
+        return False
+
 
 class SearchIndexClient:
     """Client for querying Azure AI Search"""
@@ -56,7 +107,7 @@ class SearchIndexClient:
                 # Convert search result to dictionary
                 doc = {key: value for key, value in result.items() if not key.startswith('@')}
                 # Add search score if available
-                if hasattr(result, '@search.score'):
+                if '@search.score' in result:
                     doc['search_score'] = result['@search.score']
                 documents.append(doc)
             
@@ -31,15 +31,7 @@ class StorageClient:
             blobs = self.container_client.list_blobs(name_starts_with=prefix)
             
             for blob in blobs:
-                artifact = Artifact(
-                    blob_name=blob.name,
-                    document_type=self._detect_document_type(blob.name),
-                    size_bytes=blob.size,
-                    last_modified=blob.last_modified,
-                    url=self._get_blob_url(blob.name),
-                    metadata=blob.metadata or {}
-                )
-                artifacts.append(artifact)
+                artifacts.append(self.to_artifact(blob))
             
             logger.info(f"Found {len(artifacts)} artifacts in storage")
             return artifacts
@@ -48,11 +40,25 @@ class StorageClient:
             logger.error(f"Error listing artifacts: {e}")
             raise
     
+    def to_artifact(self, blob) -> Artifact:
+        """Build an Artifact from a listed blob's properties"""
+        return Artifact(
+            blob_name=blob.name,
+            document_type=self._detect_document_type(blob.name),
+            size_bytes=blob.size,
+            last_modified=blob.last_modified,
+            url=self._get_blob_url(blob.name),
+            metadata=blob.metadata or {}
+        )
+    
     def download_artifact(self, blob_name: str) -> bytes:
         """Download artifact content as bytes"""
         try:
             blob_client = self.container_client.get_blob_client(blob_name)
-            download_stream = blob_client.download_blob()
+            # Large blobs are fetched as parallel ranged requests
+            download_stream = blob_client.download_blob(
+                max_concurrency=self.config.max_concurrency
+            )
             content = download_stream.readall()
             
             logger.info(f"Downloaded artifact: {blob_name} ({len(content)} bytes)")
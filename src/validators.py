@@ -8,6 +8,36 @@ from enum import Enum
 import ipaddress
 
 
+# Patterns used on every validated answer, compiled once
+_RESOURCE_NAME_RE = re.compile(r'^[a-z0-9-]+$')
+_BUDGET_AMOUNT_RE = re.compile(r'\$[\d,]+|\d+\s*(k|thousand|m|million)')
+
+# Recommended name prefixes per resource type
+_RECOMMENDED_PREFIXES = {
+    'vnet': ('vnet-', 'vn-'),
+    'subnet': ('snet-', 'sub-'),
+    'nsg': ('nsg-',),
+    'vm': ('vm-',),
+    'storage': ('st', 'stor'),
+    'keyvault': ('kv-',),
+    'law': ('law-', 'log-')
+}
+
+# Compliance frameworks recognised in security answers (search term -> display name)
+_COMPLIANCE_FRAMEWORKS = {
+    'pci': 'PCI-DSS',
+    'hipaa': 'HIPAA',
+    'soc': 'SOC 2',
+    'iso': 'ISO 27001',
+    'gdpr': 'GDPR',
+    'fedramp': 'FedRAMP'
+}
+# All security terms in one pass; the lookahead also finds overlapping terms
+_SECURITY_TERMS_RE = re.compile(
+    r'(?=(' + '|'.join([*_COMPLIANCE_FRAMEWORKS, 'mfa', 'multi-factor']) + r'))'
+)
+
+
 class ValidationSeverity(str, Enum):
     """Severity levels for validation findings"""
     ERROR = "error"  # Blocks deployment
@@ -82,9 +112,10 @@ class AzureValidator:
     def validate_naming_convention(name: str, resource_type: str) -> List[ValidationResult]:
         """Validate Azure resource naming conventions"""
         results = []
+        name_lower = name.lower()
         
         # General naming rules
-        if not re.match(r'^[a-z0-9-]+$', name.lower()):
+        if not _RESOURCE_NAME_RE.match(name_lower):
             results.append(ValidationResult(
                 ValidationSeverity.WARNING,
                 f"Name '{name}' contains invalid characters",
@@ -106,24 +137,13 @@ class AzureValidator:
             ))
         
         # Check for recommended prefixes
-        recommended_prefixes = {
-            'vnet': ['vnet-', 'vn-'],
-            'subnet': ['snet-', 'sub-'],
-            'nsg': ['nsg-'],
-            'vm': ['vm-'],
-            'storage': ['st', 'stor'],
-            'keyvault': ['kv-'],
-            'law': ['law-', 'log-']
-        }
-        
-        if resource_type in recommended_prefixes:
-            has_prefix = any(name.lower().startswith(prefix) for prefix in recommended_prefixes[resource_type])
-            if not has_prefix:
-                results.append(ValidationResult(
-                    ValidationSeverity.INFO,
-                    f"Consider using recommended prefix for {resource_type}",
-                    f"Suggested prefixes: {', '.join(recommended_prefixes[resource_type])}"
-                ))
+        prefixes = _RECOMMENDED_PREFIXES.get(resource_type)
+        if prefixes and not name_lower.startswith(prefixes):
+            results.append(ValidationResult(
+                ValidationSeverity.INFO,
+                f"Consider using recommended prefix for {resource_type}",
+                f"Suggested prefixes: {', '.join(prefixes)}"
+            ))
         
         return results
     
@@ -244,7 +264,7 @@ class AzureValidator:
         answer_lower = answer.lower()
         
         # Check if budget amount is specified
-        if re.search(r'\$[\d,]+|\d+\s*(k|thousand|m|million)', answer_lower):
+        if _BUDGET_AMOUNT_RE.search(answer_lower):
             results.append(ValidationResult(
                 ValidationSeverity.SUCCESS,
                 "Budget amount specified"
@@ -271,19 +291,10 @@ class AzureValidator:
         """Validate security and compliance requirements"""
         results = []
         
-        answer_lower = answer.lower()
+        found_terms = set(_SECURITY_TERMS_RE.findall(answer.lower()))
         
         # Check for compliance frameworks
-        frameworks = {
-            'pci': 'PCI-DSS',
-            'hipaa': 'HIPAA',
-            'soc': 'SOC 2',
-            'iso': 'ISO 27001',
-            'gdpr': 'GDPR',
-            'fedramp': 'FedRAMP'
-        }
-        
-        found_frameworks = [name for key, name in frameworks.items() if key in answer_lower]
+        found_frameworks = [name for key, name in _COMPLIANCE_FRAMEWORKS.items() if key in found_terms]
         
         if found_frameworks:
             results.append(ValidationResult(
@@ -293,7 +304,7 @@ class AzureValidator:
             ))
         
         # Check for MFA
-        if 'mfa' in answer_lower or 'multi-factor' in answer_lower:
+        if 'mfa' in found_terms or 'multi-factor' in found_terms:
             results.append(ValidationResult(
                 ValidationSeverity.SUCCESS,
                 "MFA requirement mentioned - critical for security"